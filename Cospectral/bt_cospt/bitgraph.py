@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compact simple-graph type for the enumeration hot loop.
+
+A `BitGraph` on vertices range(v) stores its edge set as one Python int
+over the pairs of `combinations(range(v), 2)` (bit i <-> i-th pair) plus
+one neighbour bitmask per vertex.  Spectra, walk invariants and canonical
+labelling all work on these directly; networkx graphs are only built for
+results that are actually reported.
+"""
+
+from __future__ import annotations
+from itertools import combinations
+
+import networkx as nx
+
+from canonical import canonical_labelling, iter_bits
+
+
+def _row_offsets(v: int) -> list[int]:
+    """Bit index of pair (u, u+1) in the edge mask, for each u."""
+    return [u * v - u * (u + 1) // 2 for u in range(v)]
+
+
+class BitGraph:
+    __slots__ = ("v", "edges", "nbrs")
+
+    def __init__(self, v: int, edges: int, nbrs: list[int]):
+        self.v = v            # number of vertices
+        self.edges = edges    # bitmask over combinations(range(v), 2)
+        self.nbrs = nbrs      # nbrs[u]: bitmask of the neighbours of u
+
+    # -------------------------------------------------------------- build
+    @classmethod
+    def from_edge_mask(cls, v: int, edges: int) -> "BitGraph":
+        nbrs = [0] * v
+        for u, off in enumerate(_row_offsets(v)):
+            row = (edges >> off) & ((1 << (v - u - 1)) - 1)
+            nbrs[u] |= row << (u + 1)
+            for w in iter_bits(row):
+                nbrs[u + 1 + w] |= 1 << u
+        return cls(v, edges, nbrs)
+
+    @classmethod
+    def from_adjacency(cls, nbrs: list[int]) -> "BitGraph":
+        v = len(nbrs)
+        edges = 0
+        for u, off in enumerate(_row_offsets(v)):
+            edges |= (nbrs[u] >> (u + 1)) << off
+        return cls(v, edges, list(nbrs))
+
+    @classmethod
+    def from_edges(cls, v: int, edge_set) -> "BitGraph":
+        nbrs = [0] * v
+        for u, w in edge_set:
+            nbrs[u] |= 1 << w
+            nbrs[w] |= 1 << u
+        return cls.from_adjacency(nbrs)
+
+    # -------------------------------------------------------------- query
+    def __len__(self) -> int:
+        return self.v
+
+    def size(self) -> int:
+        """Number of edges."""
+        return self.edges.bit_count()
+
+    def degrees(self) -> list[int]:
+        return [m.bit_count() for m in self.nbrs]
+
+    def edge_list(self) -> list[tuple[int, int]]:
+        return [(u, w) for u in range(self.v) for w in iter_bits(self.nbrs[u]) if u < w]
+
+    def certificate(self) -> int:
+        """Exact canonical certificate (see canonical.py)."""
+        return canonical_labelling(self.nbrs).certificate
+
+    def to_networkx(self) -> nx.Graph:
+        G = nx.Graph()
+        G.add_nodes_from(range(self.v))
+        G.add_edges_from(self.edge_list())
+        return G
+
+    def __repr__(self) -> str:
+        return f"BitGraph(v={self.v}, edges={self.edge_list()})"
+
+
+def edge_bits(v: int) -> list[int]:
+    """Single-bit masks of the pairs of range(v), in combinations order."""
+    return [1 << i for i in range(v * (v - 1) // 2)]
+
+
+def pair_index(v: int) -> dict[tuple[int, int], int]:
+    """(u, w) -> bit index in the edge mask, for u < w."""
+    return {pair: i for i, pair in enumerate(combinations(range(v), 2))}
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Spectra of every graph in graph6 / sparse6 / edge-list files.
+
+The non-interactive counterpart of get_eign.py: graphs are streamed from
+the input files (one per line, see graph6.read_graphs), collected per
+vertex count, and each full batch is diagonalised by one stacked
+`eigvalsh` per matrix.  Batches are written as .npy chunks and joined
+at the end into one file per matrix, one directory per vertex count:
+
+    OUT/v08/index.npy        int64 (N,)   position of each graph in the input
+    OUT/v08/adjacency.npy    float64 (N, 8) sorted spectra, same order
+    OUT/v08/laplacian.npy    ...
+
+Usage:
+    python bulk_spectra.py graphs8.g6 graphs9.s6 -o spectra
+    geng 10 | python bulk_spectra.py - -o spectra10 --matrices adjacency,signless
+    python bulk_spectra.py big.g6 -o out --chunk 65536
+"""
+
+from __future__ import annotations
+import argparse
+import glob
+import os
+import sys
+import time
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from bitgraph import BitGraph
+from graph6 import read_graphs
+from spectrum import MATRICES, spectrum_arrays
+
+
+class _Batches:
+    """Per-vertex-count buffers of edge masks, written out as .npy chunks."""
+
+    def __init__(self, out: str, matrices: Sequence[str], chunk: int):
+        self.out = out
+        self.matrices = matrices
+        self.chunk = chunk
+        self.masks: dict[int, list[int]] = {}
+        self.index: dict[int, list[int]] = {}
+        self.parts: dict[int, int] = {}        # chunks written so far, per v
+        self.done = 0
+        # results of an earlier run into the same directory
+        for name in ("index",) + MATRICES:
+            for path in glob.glob(os.path.join(out, "v[0-9]*", f"{name}*.npy")):
+                os.remove(path)
+
+    def add(self, i: int, adj: list[int]) -> None:
+        v = len(adj)
+        masks = self.masks.setdefault(v, [])
+        masks.append(BitGraph.from_adjacency(adj).edges)
+        self.index.setdefault(v, []).append(i)
+        if len(masks) >= self.chunk:
+            self.flush(v)
+
+    def _folder(self, v: int) -> str:
+        return os.path.join(self.out, f"v{v:02d}")
+
+    def flush(self, v: int) -> None:
+        masks, index = self.masks.pop(v, []), self.index.pop(v, [])
+        if not masks:
+            return
+        part = self.parts.get(v, 0)
+        self.parts[v] = part + 1
+        folder = self._folder(v)
+        os.makedirs(folder, exist_ok=True)
+        np.save(os.path.join(folder, f"index_{part:05d}.npy"), np.asarray(index, dtype=np.int64))
+        for m, vals in spectrum_arrays(masks, v, self.matrices).items():
+            np.save(os.path.join(folder, f"{m}_{part:05d}.npy"), vals)
+        self.done += len(masks)
+
+    def close(self) -> None:
+        for v in list(self.masks):
+            self.flush(v)
+        for v in self.parts:
+            for name in ("index",) + tuple(self.matrices):
+                self._join(os.path.join(self._folder(v), name))
+
+    def _join(self, stem: str) -> None:
+        """Copy the chunks stem_XXXXX.npy into one stem.npy and delete them."""
+        paths = sorted(glob.glob(stem + "_*.npy"))
+        if len(paths) == 1:
+            os.replace(paths[0], stem + ".npy")
+            return
+        parts = [np.load(p, mmap_mode="r") for p in paths]
+        out = np.lib.format.open_memmap(stem + ".npy", mode="w+", dtype=parts[0].dtype,
+                                        shape=(sum(len(a) for a in parts),) + parts[0].shape[1:])
+        i = 0
+        for a in parts:
+            out[i:i + len(a)] = a
+            i += len(a)
+        out.flush()
+        del out, parts
+        for p in paths:
+            os.remove(p)
+
+
+def _lines(paths: list[str]) -> Iterator[str]:
+    for path in paths:
+        if path == "-":
+            yield from sys.stdin
+            continue
+        with open(path) as fh:
+            yield from fh
+
+
+def bulk_spectra(graphs: Iterable[list[int]], out: str,
+                 matrices: Sequence[str] = ("adjacency", "laplacian"),
+                 chunk: int = 16384, report: float = 10.0) -> int:
+    """
+    Write the spectra of `graphs` (neighbour bitmasks) to `out`; returns
+    the number of graphs.  Progress goes to stderr every `report` seconds.
+    """
+    batches = _Batches(out, matrices, chunk)
+    t0 = last = time.time()
+    n = 0
+    for n, adj in enumerate(graphs, 1):
+        batches.add(n - 1, adj)
+        if time.time() - last >= report:
+            last = time.time()
+            print(f"  {n} graphs read, {batches.done} done "
+                  f"({batches.done / (last - t0):.0f} graphs/s)", file=sys.stderr)
+    batches.close()
+    dt = time.time() - t0
+    print(f"{n} graphs in {dt:.2f} s ({n / dt if dt else 0:.0f} graphs/s)", file=sys.stderr)
+    return n
+
+
+def load_spectra(out: str, v: int, matrix: str = "adjacency") -> tuple[np.ndarray, np.ndarray]:
+    """
+    (input positions, spectra) of all graphs with v vertices written to
+    `out`, as read-only memory maps (nothing is copied into RAM).
+    """
+    folder = os.path.join(out, f"v{v:02d}")
+    path = os.path.join(folder, "index.npy")
+    if not os.path.exists(path):
+        return np.zeros(0, dtype=np.int64), np.zeros((0, v))
+    return np.load(path, mmap_mode="r"), np.load(os.path.join(folder, f"{matrix}.npy"), mmap_mode="r")
+
+
+def _cli():
+    parser = argparse.ArgumentParser(description="Bulk adjacency/Laplacian spectra of graph files.")
+    parser.add_argument("files", nargs="+", help="graph6/sparse6/edge-list files ('-' = stdin)")
+    parser.add_argument("-o", "--out", default="spectra", help="output directory")
+    parser.add_argument("--matrices", default="adjacency,laplacian",
+                        help=f"comma-separated, from {', '.join(MATRICES)}")
+    parser.add_argument("--chunk", type=int, default=16384, help="graphs per batch and per file")
+    args = parser.parse_args()
+    matrices = args.matrices.split(",")
+    for m in matrices:
+        if m not in MATRICES:
+            parser.error(f"unknown matrix {m!r}")
+    bulk_spectra(read_graphs(_lines(args.files)), args.out, matrices, args.chunk)
+
+
+if __name__ == "__main__":
+    _cli()
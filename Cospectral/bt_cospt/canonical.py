@@ -1 +1,258 @@
-# __for update__
+#!/usr/bin/env python3
+"""
+Canonical labelling of small simple graphs.
+
+Pure-Python partition refinement + individualisation search (the scheme
+used by nauty), working on bitset adjacency: ``adj[u]`` is an int whose
+bit ``w`` is set when u and w are adjacent.
+
+The certificate is an int holding the upper triangle of the relabelled
+adjacency matrix, so two graphs on the same number of vertices are
+isomorphic iff their certificates are equal.  The search also returns
+generators of the automorphism group and the vertex orbits.
+"""
+
+from __future__ import annotations
+from typing import NamedTuple, Sequence
+
+
+class Labelling(NamedTuple):
+    lab: list[int]                  # canonical position -> vertex
+    certificate: int
+    generators: list[list[int]]     # automorphisms as vertex -> image
+    orbits: list[int]               # vertex -> smallest vertex in its orbit
+
+
+# ------------------------------------------------------------------
+# 1.  Bitset helpers
+# ------------------------------------------------------------------
+def vertex_mask(cell) -> int:
+    m = 0
+    for u in cell:
+        m |= 1 << u
+    return m
+
+
+def iter_bits(m: int):
+    """Yield the indices of the set bits of m, lowest first."""
+    while m:
+        low = m & -m
+        yield low.bit_length() - 1
+        m ^= low
+
+
+def bitset_adjacency(n: int, edges) -> list[int]:
+    """Neighbour bitmasks of the graph on range(n) with the given edges."""
+    adj = [0] * n
+    for u, w in edges:
+        adj[u] |= 1 << w
+        adj[w] |= 1 << u
+    return adj
+
+
+# ------------------------------------------------------------------
+# 2.  Partition refinement
+# ------------------------------------------------------------------
+def _refine(adj: Sequence[int], cells: list[list[int]], splitters: list[int]) -> tuple[int, ...]:
+    """
+    Refine the ordered partition `cells` in place until it is equitable.
+
+    Returns the trace: a flat tuple recording where and how cells were
+    split.  It is invariant under relabelling, so it can be compared
+    between nodes of the search tree.
+    """
+    trace = []
+    while splitters:
+        W = splitters.pop()
+        i = 0
+        while i < len(cells):
+            cell = cells[i]
+            if len(cell) == 1:
+                i += 1
+                continue
+            counts = [(adj[u] & W).bit_count() for u in cell]
+            if min(counts) == max(counts):
+                i += 1
+                continue
+            frags: dict[int, list[int]] = {}
+            for u, c in zip(cell, counts):
+                frags.setdefault(c, []).append(u)
+            keys = sorted(frags)
+            pieces = [frags[c] for c in keys]
+            cells[i:i + 1] = pieces
+            trace.append(i)
+            trace.append(len(pieces))
+            trace.extend(keys)
+            trace.extend(len(p) for p in pieces)
+            splitters.extend(vertex_mask(p) for p in pieces)
+            i += len(pieces)
+    trace.append(len(cells))
+    return tuple(trace)
+
+
+# ------------------------------------------------------------------
+# 3.  Search tree
+# ------------------------------------------------------------------
+def _orbit_reps(n: int, generators) -> list[int]:
+    """Union-find over the generators; returns vertex -> orbit minimum."""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for g in generators:
+        for u, w in enumerate(g):
+            ru, rw = find(u), find(w)
+            if ru != rw:
+                if ru < rw:
+                    parent[rw] = ru
+                else:
+                    parent[ru] = rw
+    return [find(u) for u in range(n)]
+
+
+class _Search:
+    """Depth-first individualisation-refinement with automorphism pruning."""
+
+    def __init__(self, adj: Sequence[int]):
+        self.adj = adj
+        self.n = len(adj)
+        self.automorphisms: list[list[int]] = []
+        self.first = None           # (traces, cert, lab, path)
+        self.best = None            # (traces, cert, lab)
+
+    def certificate(self, lab: list[int]) -> int:
+        pos = [0] * self.n
+        for i, u in enumerate(lab):
+            pos[u] = i
+        cert = 0
+        adj = self.adj
+        for j in range(1, self.n):
+            row = 0
+            for w in iter_bits(adj[lab[j]]):
+                p = pos[w]
+                if p < j:
+                    row |= 1 << p
+            cert |= row << (j * (j - 1) // 2)
+        return cert
+
+    def _record(self, lab_from: list[int], lab_to: list[int]) -> None:
+        g = [0] * self.n
+        for a, b in zip(lab_from, lab_to):
+            g[a] = b
+        self.automorphisms.append(g)
+
+    def leaf(self, cells, traces, path):
+        lab = [c[0] for c in cells]
+        cert = self.certificate(lab)
+        if self.first is None:
+            self.first = (traces, cert, lab, path)
+            self.best = (traces, cert, lab)
+            return None
+        f_traces, f_cert, f_lab, f_path = self.first
+        if traces == f_traces and cert == f_cert:
+            # equivalent to the first leaf: everything below the point where
+            # this path left the first path is an image of explored nodes
+            self._record(f_lab, lab)
+            return next(i for i, (a, b) in enumerate(zip(path, f_path)) if a != b)
+        b_traces, b_cert, b_lab = self.best
+        if (traces, cert) > (b_traces, b_cert):
+            self.best = (traces, cert, lab)
+        elif (traces, cert) == (b_traces, b_cert):
+            self._record(b_lab, lab)
+        return None
+
+    def run(self, cells, traces, path):
+        """Explore the node; return a depth to jump back to, or None."""
+        target = next((i for i, c in enumerate(cells) if len(c) > 1), None)
+        if target is None:
+            return self.leaf(cells, traces, path)
+
+        depth = len(path)
+        explored: list[int] = []
+        n_auts = -1
+        reps: list[int] = []
+        for u in sorted(cells[target]):
+            if explored:
+                if n_auts != len(self.automorphisms):
+                    n_auts = len(self.automorphisms)
+                    fixing = [g for g in self.automorphisms if all(g[p] == p for p in path)]
+                    reps = _orbit_reps(self.n, fixing)
+                if any(reps[u] == reps[x] for x in explored):
+                    continue
+            explored.append(u)
+
+            child = [list(c) for c in cells]
+            child[target:target + 1] = [[u], [w for w in cells[target] if w != u]]
+            t = _refine(self.adj, child, [1 << u])
+            child_traces = traces + [t]
+
+            if self.first is not None:
+                k = len(child_traces)
+                on_first = child_traces == self.first[0][:k]
+                if not on_first and child_traces < self.best[0][:k]:
+                    continue
+
+            jump = self.run(child, child_traces, path + [u])
+            if jump is not None and jump < depth:
+                return jump
+        return None
+
+
+def canonical_labelling(adj: Sequence[int], cells: list[list[int]] | None = None) -> Labelling:
+    """
+    Canonical labelling of the graph with bitset adjacency `adj`.
+
+    `cells` is an optional ordered partition of the vertices (a colouring)
+    that the labelling has to respect; by default all vertices start in
+    one cell.
+    """
+    n = len(adj)
+    if n == 0:
+        return Labelling([], 0, [], [])
+    if cells is None:
+        cells = [list(range(n))]
+    cells = [list(c) for c in cells if c]
+    root = _refine(adj, cells, [vertex_mask(c) for c in cells])
+
+    search = _Search(adj)
+    search.run(cells, [root], [])
+    _, cert, lab = search.best
+    gens = search.automorphisms
+    return Labelling(lab, cert, gens, _orbit_reps(n, gens))
+
+
+# ------------------------------------------------------------------
+# 4.  Certificates
+# ------------------------------------------------------------------
+def certificate(n: int, edges) -> int:
+    """Integer certificate of the graph on range(n) with the given edges."""
+    return canonical_labelling(bitset_adjacency(n, edges)).certificate
+
+
+def relabel(adj: Sequence[int], lab: Sequence[int]) -> list[int]:
+    """Adjacency of the same graph with vertex lab[i] renamed to i."""
+    pos = [0] * len(lab)
+    for i, u in enumerate(lab):
+        pos[u] = i
+    return [vertex_mask(pos[w] for w in iter_bits(adj[u])) for u in lab]
+
+
+def canonical_key(G) -> bytes:
+    """
+    Compact bytes certificate of a networkx graph (any hashable node labels).
+
+    The vertex count is stored in front, so keys of graphs with different
+    orders never collide; equal keys <=> isomorphic graphs.
+    """
+    index = {u: i for i, u in enumerate(G.nodes())}
+    n = len(index)
+    return key_bytes(n, certificate(n, ((index[u], index[w]) for u, w in G.edges())))
+
+
+def key_bytes(n: int, cert: int) -> bytes:
+    """Pack a vertex count and certificate into a compact bytes key."""
+    return n.to_bytes(4, "big") + cert.to_bytes((n * (n - 1) // 2 + 7) // 8, "big")
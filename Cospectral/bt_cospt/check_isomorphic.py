@@ -3,9 +3,20 @@
 Usage:
     python graph_isomorphic.py
 You will be prompted for the edges of graph-1, then graph-2.
+
+    python graph_isomorphic.py --batch graphs.g6     # or --batch - for stdin
+Canonicalises every graph in the file once (one graph6 string or Python
+edge list per line) and prints the isomorphism partition, grouping by
+canonical key instead of comparing all pairs.
 """
+import argparse
+import sys
+
 import networkx as nx
 
+from canonical import canonical_key, canonical_labelling, key_bytes
+from graph6 import read_graphs
+
 
 def read_one_graph(name: str) -> nx.Graph:
     G = nx.Graph()
@@ -19,11 +30,41 @@ def read_one_graph(name: str) -> nx.Graph:
     return G
 
 
+def isomorphism_classes(graphs) -> list[list[int]]:
+    """Partition of the (0-based) indices of `graphs` (neighbour bitmasks) into isomorphism classes."""
+    classes: dict[bytes, list[int]] = {}
+    for i, adj in enumerate(graphs):
+        key = key_bytes(len(adj), canonical_labelling(adj).certificate)
+        classes.setdefault(key, []).append(i)
+    return list(classes.values())
+
+
+def batch_main(path: str) -> None:
+    fh = sys.stdin if path == "-" else open(path)
+    try:
+        classes = isomorphism_classes(read_graphs(fh))
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+    n = sum(map(len, classes))
+    for k, members in enumerate(classes, 1):
+        print(f"class {k} ({len(members)} graphs): " + " ".join(str(i + 1) for i in members))
+    print(f"-> {n} graphs in {len(classes)} isomorphism classes.")
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Test graphs for isomorphism.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="partition the graphs in FILE ('-' = stdin) into isomorphism classes")
+    args = parser.parse_args()
+    if args.batch:
+        batch_main(args.batch)
+        return
+
     G1 = read_one_graph("graph-1")
     G2 = read_one_graph("graph-2")
 
-    if nx.is_isomorphic(G1, G2):
+    if canonical_key(G1) == canonical_key(G2):
         print("-> The two graphs ARE isomorphic.")
     else:
         print("-> The two graphs are NOT isomorphic.")
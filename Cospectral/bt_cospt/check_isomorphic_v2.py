@@ -3,10 +3,17 @@
 Usage:
     python graph_isomorphic.py
 Prompts for n1, edges-1, n2, edges-2.
+
+    python graph_isomorphic.py --batch graphs.g6     # or --batch - for stdin
+prints the isomorphism partition of a whole file (see check_isomorphic.py).
 """
+import argparse
 import ast
 import networkx as nx
 
+from canonical import canonical_key
+from check_isomorphic import batch_main
+
 
 def read_one_graph(name: str) -> nx.Graph:
     n = int(input(f"Number of vertices for {name}: ").strip())
@@ -20,10 +27,18 @@ def read_one_graph(name: str) -> nx.Graph:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Test graphs for isomorphism.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="partition the graphs in FILE ('-' = stdin) into isomorphism classes")
+    args = parser.parse_args()
+    if args.batch:
+        batch_main(args.batch)
+        return
+
     G1 = read_one_graph("graph-1")
     G2 = read_one_graph("graph-2")
 
-    if nx.is_isomorphic(G1, G2):
+    if canonical_key(G1) == canonical_key(G2):
         print("-> The two graphs ARE isomorphic.")
     else:
         print("-> The two graphs are NOT isomorphic.")
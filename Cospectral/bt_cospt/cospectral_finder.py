@@ -3,10 +3,10 @@
 Find all cospectral, non-isomorphic simple graphs with v vertices and e edges.
 
 Single-file version – no external dependencies except numpy and networkx.
-If the optional package `networkx-graph-hash` is installed the code
-automatically uses the full NAUTY canonical labelling; otherwise it falls
-back to a colour-refinement hash (still much faster than pairwise
-isomorphism checks).
+Isomorphism classes are told apart by the exact canonical certificate
+from `canonical.py` (partition refinement + individualisation on bitset
+adjacency), so regular and strongly-regular graphs that a
+Weisfeiler-Lehman hash cannot separate are never merged.
 """
 
 from __future__ import annotations
@@ -14,69 +14,76 @@ import sys
 import time
 from itertools import combinations
 from collections import defaultdict
+from typing import Hashable
 
 import numpy as np
 import networkx as nx
 
-import warnings
-warnings.filterwarnings("ignore", category=UserWarning, module="networkx.*graph_hashing")
+from canonical import certificate
+from spectrum import charpoly_keys, chunked, spectrum_keys
 
 # ------------------------------------------------------------------
 # 1.  Canonical-labelling helper
 # ------------------------------------------------------------------
-try:
-    # full NAUTY canonical key (needs: pip install networkx-graph-hash)
-    from networkx.algorithms.graph_hashing import graph_hash
-    _canonical_key = lambda G: graph_hash(G, node_attr=None, edge_attr=None)
-except ImportError:
-    # fall-back: Weisfeiler–Lehman hash
-    _canonical_key = lambda G: nx.weisfeiler_lehman_graph_hash(G, iterations=10)
+def _canonical_key(edge_set, v: int) -> int:
+    """Exact canonical certificate of the graph on range(v)."""
+    return certificate(v, edge_set)
 
 
 # ------------------------------------------------------------------
 # 2.  Spectrum helper
 # ------------------------------------------------------------------
-def _spectrum(graph: nx.Graph, v: int) -> tuple[float, ...]:
-    """Adjacency spectrum rounded to 8 decimals."""
-    A = np.zeros((v, v), dtype=np.float64)
-    for u, w in graph.edges:
-        A[u, w] = A[w, u] = 1.0
-    return tuple(np.round(np.linalg.eigvalsh(A), 8))
+# Candidates are keyed in chunks.  "charpoly" keys are the exact integer
+# characteristic-polynomial coefficients; "eigvals" keys are the raw bytes
+# of the spectrum rounded to 8 decimals (one stacked eigvalsh per chunk).
+def _spectrum_keys(edge_sets: list, v: int, mode: str = "charpoly") -> list:
+    if mode == "charpoly":
+        return charpoly_keys(edge_sets, v)
+    return spectrum_keys(edge_sets, v, decimals=8)
 
 
 # ------------------------------------------------------------------
 # 3.  Core routine
 # ------------------------------------------------------------------
-def find_cospectral_nonisomorphic_graphs(v: int, e: int, *, verbose: bool = True):
-    """Return list of cospectral+non-isomorphic graph sets."""
+def find_cospectral_nonisomorphic_graphs(v: int, e: int, *, verbose: bool = True,
+                                         chunk: int = 4096,
+                                         key: str = "charpoly"):
+    """
+    Return list of cospectral+non-isomorphic graph sets.
+
+    chunk : number of candidates keyed per batch.
+    key   : "charpoly" (exact integer characteristic polynomial) or
+            "eigvals" (eigenvalues rounded to 8 decimals).
+    """
     print("Finding cospectral non-isomorphic graphs...........")
     if not 0 <= e <= v * (v - 1) // 2:
         print(f"Error: edge count {e} impossible for simple graph on {v} vertices.")
         return []
+    if key not in ("charpoly", "eigvals"):
+        raise ValueError("Invalid key. Choose from 'charpoly' or 'eigvals'.")
 
     if verbose:
         print(f"Generating all graphs with v={v}, e={e} ...")
 
     possible_edges = list(combinations(range(v), 2))
 
-    # spectrum  -> list of canonical keys
-    buckets: dict[tuple[float, ...], list[str]] = defaultdict(list)
+    # spectrum  -> set of canonical keys
+    buckets: dict[Hashable, set[int]] = defaultdict(set)
     # spectrum  -> list of Graph objects (one per isomorphism class)
-    groups: dict[tuple[float, ...], list[nx.Graph]] = defaultdict(list)
+    groups: dict[Hashable, list[nx.Graph]] = defaultdict(list)
     print("list created...............")
     t0 = time.time()
     print("Running", end = " ")
-    for edge_set in combinations(possible_edges, e):
-        #print(".", end = " ")
-        G = nx.Graph()
-        G.add_edges_from(edge_set)
-
-        spec = _spectrum(G, v)
-        key = _canonical_key(G)
-
-        if key not in buckets[spec]:      # new isomorphism class for this spectrum
-            print(".", end = " ")
-            buckets[spec].append(key)
+    for batch in chunked(combinations(possible_edges, e), chunk):
+        for edge_set, spec in zip(batch, _spectrum_keys(batch, v, key)):
+            #print(".", end = " ")
+            ckey = _canonical_key(edge_set, v)
+            if ckey in buckets[spec]:
+                continue
+            print(".", end = " ")         # new isomorphism class for this spectrum
+            buckets[spec].add(ckey)
+            G = nx.Graph()
+            G.add_edges_from(edge_set)
             groups[spec].append(G)
 
     if verbose:
@@ -3,92 +3,520 @@
 Find all cospectral, non-isomorphic simple graphs with v vertices and e edges.
 
 Single-file version – no external dependencies except numpy and networkx.
-If the optional package `networkx-graph-hash` is installed the code
-automatically uses the full NAUTY canonical labelling; otherwise it falls
-back to a colour-refinement hash (still much faster than pairwise
-isomorphism checks).
+Isomorphism classes are told apart by the exact canonical certificate
+from `canonical.py` (partition refinement + individualisation on bitset
+adjacency), so regular and strongly-regular graphs that a
+Weisfeiler-Lehman hash cannot separate are never merged.
+
+By default candidates come from the canonical-augmentation generator in
+`generate.py`, which yields exactly one graph per isomorphism class, so
+no canonical key is needed at all.  `method="brute"` keeps the old
+sweep over every labelled edge subset.
+
+Long sweeps can be checkpointed and resumed:
+    python cospectral_finder_v2.py 10 22 --checkpoint v10e22.ckpt
+    python cospectral_finder_v2.py 10 22 --checkpoint v10e22.ckpt --resume
+and their sets streamed to a file instead of being kept in memory:
+    python cospectral_finder_v2.py 10 22 --sink v10e22.jsonl
 """
 
 from __future__ import annotations
+import argparse
+import json
+import os
+import pickle
 import sys
 import time
 from itertools import combinations
+from math import comb
 from collections import defaultdict
+from multiprocessing import Pool
+from typing import Hashable
 
 import numpy as np
 import networkx as nx
 
-import warnings
-warnings.filterwarnings("ignore", category=UserWarning, module="networkx.*graph_hashing")
+from bitgraph import BitGraph, edge_bits
+from canonical import vertex_mask
+from spectrum import MATRICES, chunked, matrix_keys, walk_invariants
+from generate import nonisomorphic_adjacency, subtree_adjacency, subtrees
+from graph6 import encode_graph6
 
 # ------------------------------------------------------------------
 # 1.  Canonical-labelling helper
 # ------------------------------------------------------------------
-try:
-    # full NAUTY canonical key (needs: pip install networkx-graph-hash)
-    from networkx.algorithms.graph_hashing import graph_hash
-    _canonical_key = lambda G: graph_hash(G, node_attr=None, edge_attr=None)
-except ImportError:
-    # fall-back: Weisfeiler–Lehman hash
-    _canonical_key = lambda G: nx.weisfeiler_lehman_graph_hash(G, iterations=10)
+def _canonical_key(g: BitGraph) -> int:
+    """Exact canonical certificate of the graph on range(v)."""
+    return g.certificate()
 
 
 # ------------------------------------------------------------------
 # 2.  Spectrum helper
 # ------------------------------------------------------------------
-def _spectrum(graph: nx.Graph, v: int) -> tuple[float, ...]:
-    """Adjacency spectrum rounded to 8 decimals."""
-    A = np.zeros((v, v), dtype=np.float64)
-    for u, w in graph.edges:
-        A[u, w] = A[w, u] = 1.0
-    return tuple(np.round(np.linalg.eigvalsh(A), 8))
+# Candidates are keyed in chunks.  "charpoly" keys are the exact integer
+# characteristic-polynomial coefficients (raw int64 bytes while they fit,
+# 8 bytes per coefficient instead of a tuple of ints); "eigvals" keys are
+# the raw bytes of the spectrum rounded to 8 decimals (one stacked
+# eigvalsh per chunk).
+#
+# A graph gets one key per matrix combination: a set is cospectral for
+# ("adjacency", "complement") when it shares both spectra.  All matrices
+# of all combinations come from one adjacency stack per chunk.
+_ALIASES = {"generalized": ("adjacency", "complement")}
+
+
+def _matrix_combos(matrices) -> tuple[tuple[str, ...], ...]:
+    """Normalise `matrices` entries ("laplacian", "generalized", ("adjacency", "seidel"), ...)."""
+    combos = []
+    for m in matrices:
+        combo = _ALIASES.get(m, (m,)) if isinstance(m, str) else tuple(m)
+        for name in combo:
+            if name not in MATRICES:
+                raise ValueError(f"Invalid matrix {name!r}. Choose from {', '.join(MATRICES)} "
+                                 f"or 'generalized'.")
+        combos.append(combo)
+    return tuple(combos)
+
+
+def _spectrum_keys(graphs: list[BitGraph], v: int, mode: str = "charpoly",
+                   combos=(("adjacency",),)) -> list[tuple]:
+    """Per graph, one key per matrix combination."""
+    names = list(dict.fromkeys(m for combo in combos for m in combo))
+    keys = matrix_keys(graphs, v, names, exact=(mode == "charpoly"))
+    cols = [keys[c[0]] if len(c) == 1 else list(zip(*(keys[m] for m in c))) for c in combos]
+    return list(zip(*cols))
+
+
+def _label(combo: tuple[str, ...]) -> str:
+    return "+".join(combo)
 
 
 # ------------------------------------------------------------------
-# 3.  Core routine
+# 3.  Candidate streams and tasks
 # ------------------------------------------------------------------
-def find_cospectral_nonisomorphic_graphs(v: int, e: int, *, verbose: bool = True):
-    """Return list of cospectral+non-isomorphic graph sets."""
+def _candidates(v: int, e: int, method: str):
+    """All BitGraphs to test, in one stream."""
+    if method == "orderly":
+        return map(BitGraph.from_adjacency, nonisomorphic_adjacency(v, e))
+    masks = map(sum, combinations(edge_bits(v), e))
+    return (BitGraph.from_edge_mask(v, m) for m in masks)
+
+
+def _prefilter(candidates, v: int, chunk: int, counts: dict[str, int],
+               pending: dict[tuple[int, ...], int]):
+    """
+    Stage 1: yield only candidates whose closed-walk counts
+    (tr A^3, ..., tr A^6) are shared with at least one other candidate.
+    The first candidate of each invariant tuple is parked in `pending` (as
+    its edge mask) until a second one shows up, so singletons never reach
+    the eigen/canonical stages.  Cospectral graphs have equal walk counts,
+    so no mate is ever lost.
+    """
+    for batch in chunked(candidates, chunk):
+        counts["candidates"] += len(batch)
+        for g, inv in zip(batch, walk_invariants(batch, v, kmax=6)):
+            first = pending.get(inv)
+            if first is None:
+                pending[inv] = g.edges
+                continue
+            if first != _SHARED:
+                pending[inv] = _SHARED
+                counts["walk survivors"] += 1
+                yield BitGraph.from_edge_mask(v, first)
+            counts["walk survivors"] += 1
+            yield g
+
+
+# Process-pool and checkpointed sweeps split the candidate space into
+# tasks, dealt out from one pass over it:
+# "orderly" walks the search tree once down to level v-2 (see
+# generate.subtrees) and hands the subtrees to the workers, which finish
+# them; "brute" cuts the C(C(v,2), e) edge subsets into lexicographic
+# ranges of about equal size.  Workers pick up the next job as soon as
+# they are free, so uneven subtrees do not leave the pool idle; a
+# checkpoint records the indices of the finished tasks.
+_SUBTREES_PER_JOB = 32      # orderly subtrees per pool job
+_BRUTE_TASKS = 1024         # about this many brute-force ranges
+_BLOCK = 4                  # checkpointed sweeps: >= _BLOCK * chunk candidates per block
+
+
+def _brute_tasks(v: int, e: int, size: int):
+    """
+    Edge-subset ranges (prefix mask, lo, hi, r) of at most `size` subsets
+    each (or a single subset), in lexicographic order: the prefix edges
+    plus r more, the first of them with index in [lo, hi).
+    """
+    bits = edge_bits(v)
+    M = len(bits)
+
+    def split(prefix: int, start: int, r: int):
+        if r == 0:
+            yield (prefix, start, start, 0)
+            return
+        lo, count = start, 0
+        for j in range(start, M - r + 1):
+            n = comb(M - j - 1, r - 1)          # subsets whose next edge is j
+            if n > size:
+                if j > lo:
+                    yield (prefix, lo, j, r)
+                yield from split(prefix | bits[j], j + 1, r - 1)
+                lo, count = j + 1, 0
+                continue
+            if count + n > size:
+                yield (prefix, lo, j, r)
+                lo, count = j, 0
+            count += n
+        if lo < M - r + 1:
+            yield (prefix, lo, M - r + 1, r)
+
+    return split(0, 0, e)
+
+
+def _tasks(v: int, e: int, method: str, chunk: int):
+    """Disjoint pieces of the candidate space, always in the same order."""
+    if method == "orderly":
+        return subtrees(v, e)
+    total = comb(v * (v - 1) // 2, e)
+    return _brute_tasks(v, e, max(chunk, -(-total // _BRUTE_TASKS)))
+
+
+def _task_candidates(v: int, method: str, task):
+    if method == "orderly":
+        return map(BitGraph.from_adjacency, subtree_adjacency(task))
+    bits = edge_bits(v)
+    prefix, lo, hi, r = task
+    if r == 0:
+        masks = iter([prefix])
+    else:
+        masks = (prefix + bits[j] + sum(rest)
+                 for j in range(lo, hi)
+                 for rest in combinations(bits[j + 1:], r - 1))
+    return (BitGraph.from_edge_mask(v, m) for m in masks)
+
+
+def _bucket_tasks(args) -> tuple[list[int], list[tuple[tuple, int | None, int]]]:
+    """
+    Worker: bucket a few tasks locally and return their indices with
+    compact (spectrum keys, canonical key, edge bitmask) triples, one per
+    class seen in them.  Orderly candidates are already one per class, so
+    their canonical key is None.
+    """
+    v, method, key, combos, chunk, tasks = args
+    seen: dict[Hashable, set[int]] = defaultdict(set)
+    out = []
+    candidates = (g for _, task in tasks for g in _task_candidates(v, method, task))
+    for batch in chunked(candidates, chunk):
+        for g, specs in zip(batch, _spectrum_keys(batch, v, key, combos)):
+            ckey = None
+            if method == "brute":
+                ckey = _canonical_key(g)
+                if ckey in seen[specs[0]]:
+                    continue
+                seen[specs[0]].add(ckey)
+            out.append((specs, ckey, g.edges))
+    return [i for i, _ in tasks], out
+
+
+# ------------------------------------------------------------------
+# 4.  Sweep state and checkpoints
+# ------------------------------------------------------------------
+_SHARED = -1                # `pending` marker: invariant already seen twice
+
+
+class _Sweep:
+    """
+    Everything a (v, e) sweep has accumulated, in picklable form.  It is
+    only saved between blocks of tasks, so a saved state never holds half
+    a task.
+    """
+
+    def __init__(self, params: tuple, stream: bool = False):
+        self.params = params        # (v, e, method, key, combos, prefilter, chunk)
+        n_combos = len(params[4])
+        self.done: set[int] = set()
+        # spectrum of the first combination -> set of canonical keys
+        self.buckets: dict[Hashable, set[int]] = defaultdict(set)
+        # per combination, spectrum -> edge masks (one per isomorphism
+        # class); when streaming, only the first class's mask, or ~set
+        # number once the spectrum has a second class and its set has
+        # gone to the sink
+        self.groups: list[dict[Hashable, list[int] | int]] = [{} for _ in range(n_combos)]
+        self.stream = stream
+        self.sets = [0] * n_combos  # sets written to the sink, per combination
+        self.sink_size = 0          # sink bytes covered by this state
+        self.out: list[tuple[int, int, int]] = []   # (combination, set, mask) to write
+        # walk invariants -> parked edge mask, or _SHARED
+        self.pending: dict[tuple[int, ...], int] = {}
+        self.counts = dict.fromkeys(("candidates", "walk survivors", "spectrum keys",
+                                     "canonical keys", "classes"), 0)
+
+    def save(self, path: str) -> None:
+        assert not self.out, "flush the sink before saving"
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            pickle.dump(self.__dict__, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)           # atomic: a crash never leaves half a file
+
+    @classmethod
+    def load(cls, path: str, params: tuple, stream: bool = False) -> "_Sweep":
+        with open(path, "rb") as fh:
+            state = pickle.load(fh)
+        if state["params"] != params or state["stream"] != stream:
+            raise ValueError(f"checkpoint {path} was written for {state['params']}, not {params}")
+        sweep = cls(params, stream)
+        sweep.__dict__.update(state)
+        return sweep
+
+    def add(self, specs: tuple, ckey: int | None, mask: int) -> bool:
+        """Record a class; False if (brute mode) it was already known."""
+        if ckey is not None:
+            if ckey in self.buckets[specs[0]]:
+                return False
+            self.buckets[specs[0]].add(ckey)
+        for c, (groups, spec) in enumerate(zip(self.groups, specs)):
+            if not self.stream:
+                groups.setdefault(spec, []).append(mask)
+                continue
+            first = groups.get(spec)
+            if first is None:
+                groups[spec] = mask
+            elif first >= 0:
+                # second class: the set is confirmed, write both members
+                k = self.sets[c]
+                groups[spec] = ~k
+                self.out += [(c, k, first), (c, k, mask)]
+                self.sets[c] += 1
+            else:
+                self.out.append((c, ~first, mask))
+        return True
+
+
+class _Sink:
+    """
+    JSONL file of cospectral sets, one line per member:
+        {"matrices": "adjacency", "set": 0, "v": 8, "e": 13,
+         "graph6": "G?`FE_", "edges": [[0, 5], ...]}
+    Members of a set share "matrices" and "set"; later classes of an
+    already written set are appended as they are found.
+    """
+
+    def __init__(self, path: str, v: int, e: int, combos: tuple,
+                 size: int | None = None):
+        self.v, self.e = v, e
+        self.labels = [_label(c) for c in combos]
+        if size is None:
+            self.fh = open(path, "w")
+            return
+        # resuming: drop whatever was written after the checkpoint
+        found = os.path.getsize(path) if os.path.exists(path) else 0
+        if found < size:
+            raise ValueError(f"sink {path} holds {found} bytes, the checkpoint expects {size}; "
+                             f"it was moved or cut, so the sweep has to start over")
+        self.fh = open(path, "r+" if os.path.exists(path) else "w")
+        self.fh.truncate(size)
+        self.fh.seek(size)
+
+    def write(self, records: list[tuple[int, int, int]]) -> None:
+        for c, k, mask in records:
+            g = BitGraph.from_edge_mask(self.v, mask)
+            self.fh.write(json.dumps({"matrices": self.labels[c], "set": k,
+                                      "v": self.v, "e": self.e,
+                                      "graph6": encode_graph6(g.nbrs),
+                                      "edges": g.edge_list()}) + "\n")
+        if records:
+            self.fh.flush()
+            records.clear()
+
+    def tell(self) -> int:
+        self.fh.flush()
+        return self.fh.tell()
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+def _bucket_stream(sweep: _Sweep, candidates, v: int, method: str, key: str,
+                   combos: tuple, chunk: int, prefilter: bool,
+                   out: _Sink | None = None) -> None:
+    """
+    Single-process bucketing of one candidate stream into `sweep`; sets
+    found in a batch are written to `out` right after it.
+    """
+    counts = sweep.counts
+    if prefilter:
+        candidates = _prefilter(candidates, v, chunk, counts, sweep.pending)
+    for batch in chunked(candidates, chunk):
+        if not prefilter:
+            counts["candidates"] += len(batch)
+        counts["spectrum keys"] += len(batch)
+        for g, specs in zip(batch, _spectrum_keys(batch, v, key, combos)):
+            #print(".", end = " ")
+            ckey = None
+            if method == "brute":
+                counts["canonical keys"] += 1
+                ckey = _canonical_key(g)
+            if sweep.add(specs, ckey, g.edges):
+                counts["classes"] += 1
+                if method == "brute":
+                    print(".", end = " ")     # new isomorphism class for this spectrum
+        if out is not None:
+            out.write(sweep.out)
+
+
+# ------------------------------------------------------------------
+# 5.  Core routine
+# ------------------------------------------------------------------
+def find_cospectral_nonisomorphic_graphs(v: int, e: int, *, verbose: bool = True,
+                                         method: str = "orderly", chunk: int = 4096,
+                                         key: str = "charpoly", workers: int = 1,
+                                         prefilter: bool = True,
+                                         checkpoint: str | None = None, resume: bool = False,
+                                         checkpoint_every: float = 60.0,
+                                         sink: str | None = None, matrices=None):
+    """
+    Return list of cospectral+non-isomorphic graph sets.
+
+    method  : "orderly" (one candidate per isomorphism class) or "brute"
+              (all C(C(v,2), e) labelled graphs, deduplicated by key).
+    chunk   : number of candidates keyed per batch.
+    key     : "charpoly" (exact integer characteristic polynomial) or
+              "eigvals" (eigenvalues rounded to 8 decimals).
+    workers : number of processes; above 1 the search tree is walked once
+              and its level-(v-2) subtrees (brute: ranges of edge subsets
+              of about equal size) are bucketed in a process pool and
+              merged.
+    prefilter : drop candidates whose closed-walk counts match no other
+              candidate before any spectrum or canonical key is computed
+              (single-process mode; workers cannot see each other).
+    checkpoint : file the sweep state is saved to after a finished block
+              of tasks (see `_tasks`), at most every `checkpoint_every`
+              seconds, and at the end.
+    resume  : continue from `checkpoint` if it exists, skipping the tasks
+              it records as done.
+    sink    : stream the sets to this JSONL file (see `_Sink`) as soon as
+              a spectrum has a second class, keeping one edge bitmask per
+              unmatched spectrum instead of every class; the number of
+              sets is returned instead of the sets.
+    matrices : matrix combinations to bucket by, all in the same pass,
+              e.g. ["adjacency", "laplacian", ("adjacency", "seidel")].
+              A tuple asks for sets cospectral for every matrix in it;
+              "generalized" is ("adjacency", "complement").  Matrices are
+              "adjacency", "laplacian", "signless", "normalized",
+              "seidel" and "complement".  When given, the result is a
+              dict from "adjacency+complement"-style labels to the sets
+              (or set counts, with `sink`).
+    """
     print("Finding cospectral non-isomorphic graphs...........")
+    combos = _matrix_combos(["adjacency"] if matrices is None else matrices)
     if not 0 <= e <= v * (v - 1) // 2:
         print(f"Error: edge count {e} impossible for simple graph on {v} vertices.")
-        return []
+        if matrices is None:
+            return []
+        return {_label(c): 0 if sink is not None else [] for c in combos}
+    if key not in ("charpoly", "eigvals"):
+        raise ValueError("Invalid key. Choose from 'charpoly' or 'eigvals'.")
+    if method not in ("orderly", "brute"):
+        raise ValueError("Invalid method. Choose from 'orderly' or 'brute'.")
+    # walk counts are adjacency invariants: they only prune when every
+    # combination needs adjacency cospectrality
+    prefilter = prefilter and all("adjacency" in c for c in combos)
 
     if verbose:
         print(f"Generating all graphs with v={v}, e={e} ...")
 
-    possible_edges = list(combinations(range(v), 2))
+    if workers > 1:
+        prefilter = False
+    # chunk sets the size of the brute-force tasks
+    params = (v, e, method, key, combos, prefilter, chunk)
+    stream = sink is not None
+    if resume and checkpoint and os.path.exists(checkpoint):
+        sweep = _Sweep.load(checkpoint, params, stream)
+        print(f"resuming from {checkpoint}: {len(sweep.done)} tasks done")
+        out = _Sink(sink, v, e, combos, sweep.sink_size) if stream else None
+    else:
+        sweep = _Sweep(params, stream)
+        out = _Sink(sink, v, e, combos) if stream else None
+    last_save = time.time()
+
+    def finished(*done: int) -> None:
+        nonlocal last_save
+        sweep.done.update(done)
+        if checkpoint and time.time() - last_save >= checkpoint_every:
+            if out is not None:
+                sweep.sink_size = out.tell()
+            sweep.save(checkpoint)
+            last_save = time.time()
 
-    # spectrum  -> list of canonical keys
-    buckets: dict[tuple[float, ...], list[str]] = defaultdict(list)
-    # spectrum  -> list of Graph objects (one per isomorphism class)
-    groups: dict[tuple[float, ...], list[nx.Graph]] = defaultdict(list)
     print("list created...............")
     #t0 = time.time()
     print("Running", end = " ")
-    for edge_set in combinations(possible_edges, e):
-        #print(".", end = " ")
-        G = nx.Graph()
-        G.add_edges_from(edge_set)
-
-        spec = _spectrum(G, v)
-        key = _canonical_key(G)
-
-        if key not in buckets[spec]:      # new isomorphism class for this spectrum
-            print(".", end = " ")
-            buckets[spec].append(key)
-            groups[spec].append(G)
+    if workers > 1:
+        # the tasks are produced in the pool's feeder thread, so the single
+        # walk down the search tree overlaps with the workers
+        skip = set(sweep.done)
+        todo = ((i, task) for i, task in enumerate(_tasks(v, e, method, chunk))
+                if i not in skip)
+        jobs = ((v, method, key, combos, chunk, group)
+                for group in chunked(todo, _SUBTREES_PER_JOB if method == "orderly" else 1))
+        with Pool(workers) as pool:
+            for done, triples in pool.imap_unordered(_bucket_tasks, jobs):
+                print(".", end = " ", flush=True)
+                for specs, ckey, mask in triples:
+                    sweep.add(specs, ckey, mask)
+                if out is not None:
+                    out.write(sweep.out)
+                finished(*done)
+    elif not checkpoint:
+        _bucket_stream(sweep, _candidates(v, e, method), v, method, key,
+                       combos, chunk, prefilter, out)
+    else:
+        # the same tasks, in order, bucketed in blocks of whole tasks so
+        # the state can be saved between blocks
+        block, ids = [], []
+        for i, task in enumerate(_tasks(v, e, method, chunk)):
+            if i in sweep.done:
+                continue
+            block.extend(_task_candidates(v, method, task))
+            ids.append(i)
+            if len(block) >= _BLOCK * chunk:
+                _bucket_stream(sweep, block, v, method, key, combos, chunk, prefilter, out)
+                finished(*ids)
+                block, ids = [], []
+        if ids:
+            _bucket_stream(sweep, block, v, method, key, combos, chunk, prefilter, out)
+            finished(*ids)
+    if out is not None:
+        sweep.sink_size = out.tell()
+        out.close()
+    if checkpoint:
+        sweep.save(checkpoint)
 
     if verbose:
         print(f"\n  finished generation + bucketing")
-        
+        if workers <= 1:
+            total = sweep.counts["candidates"] or 1
+            for stage, n in sweep.counts.items():
+                print(f"  {stage:>15}: {n:>10}  ({100 * n / total:5.1f}%)")
+        if stream:
+            for combo, n in zip(combos, sweep.sets):
+                print(f"  {n} {_label(combo)} cospectral sets written to {sink}")
+
 
-    # keep only spectra with more than one isomorphism class
-    return [grp for grp in groups.values() if len(grp) > 1]
+    if stream:
+        found = sweep.sets
+    else:
+        # keep only spectra with more than one isomorphism class; networkx
+        # graphs are built for these reported sets only
+        found = [[[BitGraph.from_edge_mask(v, m).to_networkx() for m in grp]
+                  for grp in groups.values() if len(grp) > 1]
+                 for groups in sweep.groups]
+    if matrices is None:
+        return found[0]
+    return {_label(c): f for c, f in zip(combos, found)}
 
 
 # ------------------------------------------------------------------
-# 4.  Pretty printer
+# 6.  Pretty printer
 # ------------------------------------------------------------------
 def _pretty_print(cospectral_sets: list[list[nx.Graph]]) -> None:
     if not cospectral_sets:
@@ -100,23 +528,52 @@ def _pretty_print(cospectral_sets: list[list[nx.Graph]]) -> None:
         print(f"\n--- set {idx}  ({len(graphs)} non-isomorphic graphs) ---")
         for j, G in enumerate(graphs, 1):
             spec = np.linalg.eigvalsh(nx.to_numpy_array(G))
-            print(f"Graph {j}:  edges={list(G.edges())}")
+            g6 = encode_graph6([vertex_mask(G[u]) for u in range(len(G))])
+            print(f"Graph {j}:  graph6={g6}  edges={list(G.edges())}")
             print(f"   spectrum: {np.round(spec, 4)}")
 
 
 # ------------------------------------------------------------------
-# 5.  Command-line interface
+# 7.  Command-line interface
 # ------------------------------------------------------------------
 def _cli():
-    try:
-        v = int(input("v (vertices): ").strip())
-        e = int(input("e (edges): ").strip())
-    except ValueError:
-        print("Please enter integers.")
-        sys.exit(1)
-
-    sets = find_cospectral_nonisomorphic_graphs(v, e)
-    _pretty_print(sets)
+    parser = argparse.ArgumentParser(
+        description="Find cospectral, non-isomorphic graphs with v vertices and e edges.")
+    parser.add_argument("v", type=int, nargs="?", help="vertices (prompted if omitted)")
+    parser.add_argument("e", type=int, nargs="?", help="edges (prompted if omitted)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--checkpoint", metavar="FILE", help="save sweep state to FILE")
+    parser.add_argument("--resume", action="store_true", help="continue from --checkpoint")
+    parser.add_argument("--sink", metavar="FILE", help="stream sets to a JSONL file")
+    parser.add_argument("--matrix", action="append", metavar="M[+M...]",
+                        help="bucket by this matrix or '+'-joined combination "
+                             "(repeatable; e.g. laplacian, adjacency+complement)")
+    args = parser.parse_args()
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint FILE")
+
+    v, e = args.v, args.e
+    if v is None or e is None:
+        try:
+            v = int(input("v (vertices): ").strip())
+            e = int(input("e (edges): ").strip())
+        except ValueError:
+            print("Please enter integers.")
+            sys.exit(1)
+
+    sets = find_cospectral_nonisomorphic_graphs(v, e, workers=args.workers,
+                                                checkpoint=args.checkpoint,
+                                                resume=args.resume, sink=args.sink,
+                                                matrices=None if args.matrix is None else
+                                                [tuple(m.split("+")) for m in args.matrix])
+    if args.sink is not None:
+        return
+    if args.matrix is None:
+        _pretty_print(sets)
+        return
+    for label, found in sets.items():
+        print(f"\n===== {label} =====")
+        _pretty_print(found)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Is a graph determined by its spectrum (DS)?
+
+`cospectral_mates(G)` keys G once (exact characteristic polynomial and
+canonical certificate) and answers from the spectrum index of a
+`GraphDB` catalogue when one is given; the first query for a (v, e)
+that is not catalogued yet populates it, so later queries are index
+lookups.  Without a catalogue it searches only the classes with G's
+vertex and edge counts (a cospectral mate has the same tr M and tr M^2)
+whose traces tr M^2 .. tr M^6 equal G's, and computes characteristic
+polynomials for those survivors only.
+
+Usage:
+    python ds.py "Ds_" "Ch"                     # graph6 arguments
+    python ds.py --db graphs.sqlite < list.g6   # one graph6 per line
+    python ds.py --matrix laplacian "Ds_"
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+
+import networkx as nx
+
+from bitgraph import BitGraph
+from canonical import canonical_labelling
+from generate import nonisomorphic_adjacency
+from graph6 import decode, decode_graph6, encode_graph6
+from graphdb import MATRICES, GraphDB
+from spectrum import charpoly_keys, chunked, power_traces
+
+
+def as_bitgraph(G) -> BitGraph:
+    """BitGraph of a BitGraph, a networkx graph or a graph6 / sparse6 string."""
+    if isinstance(G, BitGraph):
+        return G
+    if isinstance(G, str):
+        return BitGraph.from_adjacency(decode(G))
+    if isinstance(G, nx.Graph):
+        index = {u: i for i, u in enumerate(G.nodes())}
+        return BitGraph.from_edges(len(index), ((index[u], index[w]) for u, w in G.edges()))
+    raise TypeError(f"expected a BitGraph, networkx graph or graph6/sparse6 string, not {type(G).__name__}")
+
+
+def _search(g: BitGraph, matrix: str, chunk: int) -> list[BitGraph]:
+    """Mates of g among all classes with its order and size, without an index."""
+    v = g.v
+    target_traces = power_traces([g], v, matrix, 2, 6)[0]
+    target_poly = charpoly_keys([g], v, matrix)[0]
+    cert = canonical_labelling(g.nbrs).certificate
+    mates = []
+    candidates = map(BitGraph.from_adjacency, nonisomorphic_adjacency(v, g.size()))
+    for batch in chunked(candidates, chunk):
+        survivors = [h for h, t in zip(batch, power_traces(batch, v, matrix, 2, 6))
+                     if t == target_traces]
+        if not survivors:
+            continue
+        for h, poly in zip(survivors, charpoly_keys(survivors, v, matrix)):
+            if poly == target_poly and h.certificate() != cert:
+                mates.append(h)
+    return mates
+
+
+def cospectral_mates(G, matrix: str = "adjacency", db: GraphDB | None = None,
+                     chunk: int = 4096) -> list[BitGraph]:
+    """
+    One graph per isomorphism class that is cospectral with G for
+    `matrix` ("adjacency", "laplacian" or "signless") but not isomorphic
+    to it.  With `db`, G's (v, e) is populated on first use and every
+    query is answered from its index.
+    """
+    if matrix not in MATRICES:
+        raise ValueError("Invalid matrix. Choose from 'adjacency', 'laplacian' or 'signless'.")
+    g = as_bitgraph(G)
+    if db is None:
+        return _search(g, matrix, chunk)
+    if not db.is_complete(g.v, g.size()):
+        db.populate(g.v, g.size(), chunk)
+    return [BitGraph.from_adjacency(decode_graph6(s)) for s in db.cospectral_mates(g, matrix)]
+
+
+def is_DS(G, matrix: str = "adjacency", db: GraphDB | None = None) -> bool:
+    """True if no non-isomorphic graph has the same `matrix` spectrum as G."""
+    return not cospectral_mates(G, matrix, db)
+
+
+def _cli():
+    parser = argparse.ArgumentParser(description="Check whether graphs are determined by their spectrum.")
+    parser.add_argument("graph6", nargs="*", help="graph6/sparse6 graphs to check (default: read stdin)")
+    parser.add_argument("--matrix", default="adjacency", choices=MATRICES)
+    parser.add_argument("--db", help="SQLite catalogue to answer from (see graphdb.py)")
+    args = parser.parse_args()
+
+    lines = args.graph6 or (line.strip() for line in sys.stdin)
+    db = GraphDB(args.db) if args.db else None
+    try:
+        for s in lines:
+            if not s:
+                continue
+            mates = cospectral_mates(s, args.matrix, db)
+            if mates:
+                print(f"{s}: NOT DS, {len(mates)} mate(s): "
+                      + " ".join(encode_graph6(h.nbrs) for h in mates))
+            else:
+                print(f"{s}: DS")
+    finally:
+        if db is not None:
+            db.close()
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Generate one graph per isomorphism class with v vertices and e edges.
+
+Canonical augmentation (McKay's method) by vertices: a graph on m+1
+vertices is accepted only if the vertex just added is, up to
+automorphism, its canonical deletion vertex – a minimum-degree vertex
+chosen through the canonical labelling in `canonical.py`.  Children of
+the same parent are deduplicated through the orbits of the parent's
+automorphism group on neighbourhoods, so no isomorphism class is output
+twice and no set of already-seen graphs has to be kept in memory.
+
+Degree bounds and connectivity are enforced inside the search: every
+ancestor is an induced subgraph, so a vertex over the maximum degree
+prunes its whole subtree, and the deleted vertex has minimum degree, so
+the minimum degree bounds the degree of each added vertex.
+
+Usage:
+    python generate.py            # prompts for v and e, prints the count
+"""
+
+from __future__ import annotations
+import sys
+from itertools import combinations
+from typing import Iterator, NamedTuple
+
+from canonical import canonical_labelling, iter_bits, vertex_mask
+
+
+# ------------------------------------------------------------------
+# 1.  Edge-count bounds per level
+# ------------------------------------------------------------------
+def _edge_bounds(v: int, e: int, e_max: int | None = None) -> tuple[list[int], list[int]]:
+    """
+    lo[m], hi[m] bound the edge count of the m-vertex ancestor of any
+    graph with v vertices and e edges (e .. e_max edges if given).
+    Deleting a minimum-degree vertex from a graph with j vertices and x
+    edges leaves at least x(j-2)/j edges, which gives the lower bound.
+    """
+    e_max = e if e_max is None else e_max
+    lo = [0] * (v + 1)
+    hi = [0] * (v + 1)
+    lo[v] = e
+    for m in range(v - 1, 0, -1):
+        lo[m] = -(-lo[m + 1] * (m - 1) // (m + 1))
+    for m in range(1, v + 1):
+        hi[m] = min(e_max, m * (m - 1) // 2)
+    return lo, hi
+
+
+# ------------------------------------------------------------------
+# 2.  Augmentation
+# ------------------------------------------------------------------
+class _Limits(NamedTuple):
+    """Constraints on the output graphs, checked during augmentation."""
+    min_degree: int
+    max_degree: int
+    connected: bool
+
+
+def _is_connected(adj: list[int]) -> bool:
+    reached = frontier = 1
+    while frontier:
+        nxt = 0
+        for u in iter_bits(frontier):
+            nxt |= adj[u]
+        frontier = nxt & ~reached
+        reached |= frontier
+    return reached == (1 << len(adj)) - 1
+
+
+def _apply(g: list[int], mask: int) -> int:
+    out = 0
+    for u in iter_bits(mask):
+        out |= 1 << g[u]
+    return out
+
+
+def _is_canonical_child(adj: list[int], k: int) -> bool:
+    """Is the last vertex (degree k, the minimum) the canonical deletion?"""
+    m = len(adj)
+    x = m - 1
+    deg = [a.bit_count() for a in adj]
+
+    def inv(u):
+        return sorted(deg[w] for w in iter_bits(adj[u]))
+
+    cands = [u for u in range(m) if deg[u] == k]
+    if len(cands) == 1:
+        return True
+    invs = {u: inv(u) for u in cands}
+    top = max(invs.values())
+    if invs[x] != top:
+        return False
+    cands = [u for u in cands if invs[u] == top]
+    if len(cands) == 1:
+        return True
+    lab = canonical_labelling(adj)
+    chosen = next(u for u in reversed(lab.lab) if u in cands)
+    return lab.orbits[chosen] == lab.orbits[x]
+
+
+def _extend(adj: list[int], edges: int, gens: list[list[int]],
+            v: int, lo: list[int], hi: list[int],
+            limits: _Limits | None = None,
+            stop: int | None = None) -> Iterator[list[int]]:
+    """Accepted descendants of `adj` on v vertices, or on `stop` if given."""
+    m = len(adj)
+    stop = v if stop is None else stop
+    if m == stop:
+        yield adj
+        return
+
+    deg = [a.bit_count() for a in adj]
+    k_lo = max(0, lo[m + 1] - edges)
+    k_hi = min(m, hi[m + 1] - edges)
+    if limits is not None:
+        # k is the child's minimum degree; its vertices gain at most one
+        # neighbour per vertex still to come
+        k_lo = max(k_lo, limits.min_degree - (v - m - 1))
+        k_hi = min(k_hi, limits.max_degree)
+    for k in range(k_lo, k_hi + 1):
+        # every old vertex must keep degree >= k in the child
+        if any(d < k - 1 for d in deg):
+            continue
+        forced = vertex_mask(u for u in range(m) if deg[u] == k - 1)
+        n_forced = forced.bit_count()
+        if n_forced > k:
+            continue
+        optional = [u for u in range(m) if deg[u] >= k
+                    and (limits is None or deg[u] < limits.max_degree)]
+
+        seen: set[int] = set()
+        for extra in combinations(optional, k - n_forced):
+            nbrs = forced | vertex_mask(extra)
+            if nbrs in seen:
+                continue
+            # mark the whole Aut(parent)-orbit of this neighbourhood
+            orbit = [nbrs]
+            seen.add(nbrs)
+            for s in orbit:
+                for g in gens:
+                    t = _apply(g, s)
+                    if t not in seen:
+                        seen.add(t)
+                        orbit.append(t)
+
+            child = adj + [nbrs]
+            for u in iter_bits(nbrs):
+                child[u] = adj[u] | (1 << m)
+            if m + 1 == v and limits is not None and limits.connected and not _is_connected(child):
+                continue
+            if not _is_canonical_child(child, k):
+                continue
+            if m + 1 == stop:
+                yield child
+            else:
+                child_gens = canonical_labelling(child).generators
+                yield from _extend(child, edges + k, child_gens, v, lo, hi, limits, stop)
+
+
+# ------------------------------------------------------------------
+# 3.  Search trees and subtrees
+# ------------------------------------------------------------------
+class _Search(NamedTuple):
+    """One search tree: what `_extend` needs below any of its nodes."""
+    v: int
+    lo: list[int]
+    hi: list[int]
+    limits: _Limits | None
+    complement: bool            # leaves are complemented on output
+
+
+class Subtree(NamedTuple):
+    """A node of the search tree; `subtree_adjacency` yields its leaves."""
+    search: _Search
+    adj: list[int]
+
+
+def _search(v: int, e: int | None = None, *, min_degree: int = 0,
+            max_degree: int | None = None, connected: bool = False) -> _Search | None:
+    """The search tree for these arguments (see nonisomorphic_adjacency), or None if empty."""
+    full = v * (v - 1) // 2
+    max_degree = v - 1 if max_degree is None else min(max_degree, v - 1)
+    if connected and v > 1:
+        min_degree = max(min_degree, 1)
+    if v < 1 or min_degree > max_degree:
+        return None
+    # edge counts the degree bounds allow
+    e_lo, e_hi = -(-v * min_degree // 2), v * max_degree // 2
+    if connected:
+        e_lo = max(e_lo, v - 1)
+    if e is not None:
+        if not max(0, e_lo) <= e <= min(full, e_hi):
+            return None
+        e_lo = e_hi = e
+    if e is not None and 2 * e > full and not connected:
+        # complements: degree d <-> v - 1 - d
+        search = _search(v, full - e, min_degree=v - 1 - max_degree,
+                         max_degree=v - 1 - min_degree)
+        return None if search is None else search._replace(complement=True)
+    lo, hi = _edge_bounds(v, max(0, e_lo), min(full, e_hi))
+    limits = None
+    if min_degree > 0 or max_degree < v - 1 or connected:
+        limits = _Limits(min_degree, max_degree, connected)
+    return _Search(v, lo, hi, limits, False)
+
+
+def subtrees(v: int, e: int | None = None, level: int | None = None,
+             **limits) -> Iterator[Subtree]:
+    """
+    The accepted nodes on `level` vertices (default v - 2) of the search
+    tree of nonisomorphic_adjacency(v, e, **limits), in search order.
+    Their subtrees hold every output graph exactly once, so one walk down
+    to `level` deals out disjoint pieces of work (to a process pool, or
+    as checkpoint units) that subtree_adjacency finishes independently.
+    """
+    search = _search(v, e, **limits)
+    if search is None:
+        return
+    level = min(v, max(1, v - 2) if level is None else level)
+    for adj in _extend([0], 0, [], v, search.lo, search.hi, search.limits, level):
+        yield Subtree(search, adj)
+
+
+def subtree_adjacency(sub: Subtree) -> Iterator[list[int]]:
+    """Output graphs (bitset adjacency lists) in the subtree of `sub`."""
+    search, adj = sub
+    v = search.v
+    if len(adj) == v:
+        leaves = [adj]
+    else:
+        edges = sum(a.bit_count() for a in adj) // 2
+        gens = canonical_labelling(adj).generators if len(adj) > 1 else []
+        leaves = _extend(adj, edges, gens, v, search.lo, search.hi, search.limits)
+    if not search.complement:
+        yield from leaves
+        return
+    everyone = (1 << v) - 1
+    for leaf in leaves:
+        yield [everyone & ~a & ~(1 << u) for u, a in enumerate(leaf)]
+
+
+# ------------------------------------------------------------------
+# 4.  Public generators
+# ------------------------------------------------------------------
+def nonisomorphic_adjacency(v: int, e: int | None = None,
+                            shard: tuple[int, int] | None = None, *,
+                            min_degree: int = 0, max_degree: int | None = None,
+                            connected: bool = False) -> Iterator[list[int]]:
+    """
+    Yield bitset adjacency lists, one per isomorphism class.
+
+    e=None yields every edge count (one search tree, not one per e).
+    min_degree, max_degree and connected restrict the output and prune
+    the search; they cost nothing when left at their defaults.
+
+    shard=(i, n) yields only the i-th of n disjoint parts of the output:
+    the `subtrees` dealt out round-robin.  Every shard walks the tree
+    down to their level again; within one program, deal the subtrees of
+    a single walk instead.
+    """
+    limits = dict(min_degree=min_degree, max_degree=max_degree, connected=connected)
+    if shard is None:
+        search = _search(v, e, **limits)
+        if search is not None:
+            yield from subtree_adjacency(Subtree(search, [0]))
+        return
+    i, n = shard
+    for j, sub in enumerate(subtrees(v, e, **limits)):
+        if j % n == i:
+            yield from subtree_adjacency(sub)
+
+
+def nonisomorphic_graphs(v: int, e: int | None = None,
+                         shard: tuple[int, int] | None = None,
+                         **limits) -> Iterator[tuple[tuple[int, int], ...]]:
+    """
+    Yield edge tuples (u < w), one graph per isomorphism class; keyword
+    arguments as in nonisomorphic_adjacency.
+    """
+    for adj in nonisomorphic_adjacency(v, e, shard, **limits):
+        yield tuple((u, w) for u in range(v) for w in iter_bits(adj[u]) if u < w)
+
+
+def _cli():
+    try:
+        v = int(input("v (vertices): ").strip())
+        e = int(input("e (edges): ").strip())
+    except ValueError:
+        print("Please enter integers.")
+        sys.exit(1)
+    count = sum(1 for _ in nonisomorphic_adjacency(v, e))
+    print(f"{count} non-isomorphic graphs with v={v}, e={e}")
+
+
+if __name__ == "__main__":
+    _cli()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+graph6 / sparse6 encoding of simple graphs given as neighbour bitmasks,
+and streaming / memory-mapped files of them.
+
+graph6 (McKay's format, also used by nauty, Sage and networkx) stores the
+vertex count followed by the upper triangle of the adjacency matrix,
+column by column, six bits per printable character.  Both directions are
+done on whole ints: the triangle is assembled as one bitmask and cut into
+6-bit groups, instead of one Python operation per matrix entry.  sparse6
+stores an edge list instead and is the shorter one for sparse graphs.
+
+A graph file has one graph per line (either format, optionally with a
+">>graph6<<" / ">>sparse6<<" header).  `GraphWriter` and `iter_file`
+stream such files; `Catalogue` memory-maps one and indexes its line
+offsets once (cached next to it as FILE.idx.npy), so slicing a
+multi-gigabyte catalogue reads only the lines asked for.
+"""
+
+from __future__ import annotations
+import ast
+import mmap
+import os
+import sys
+from typing import IO, Iterable, Iterator
+
+import numpy as np
+
+from canonical import iter_bits
+
+# reverse the bit order of a 6-bit group (graph6 puts the first bit high)
+_REV6 = [int(f"{x:06b}"[::-1], 2) for x in range(64)]
+
+
+def _encode_n(n: int) -> str:
+    if n < 63:
+        return chr(63 + n)
+    if n < 258048:
+        return "~" + "".join(chr(63 + ((n >> s) & 63)) for s in (12, 6, 0))
+    return "~~" + "".join(chr(63 + ((n >> s) & 63)) for s in (30, 24, 18, 12, 6, 0))
+
+
+def _decode_n(s: str) -> tuple[int, int]:
+    """Return (n, index of the first data character)."""
+    if s[0] != "~":
+        return ord(s[0]) - 63, 1
+    if s[1] != "~":
+        width, start = 3, 1
+    else:
+        width, start = 6, 2
+    n = 0
+    for ch in s[start:start + width]:
+        n = (n << 6) | (ord(ch) - 63)
+    return n, start + width
+
+
+def encode_graph6(adj: list[int]) -> str:
+    """graph6 string (without header or newline) of the graph adj."""
+    n = len(adj)
+    tri = 0
+    off = 0
+    for j in range(1, n):
+        tri |= (adj[j] & ((1 << j) - 1)) << off
+        off += j
+    groups = (off + 5) // 6
+    return _encode_n(n) + "".join(chr(63 + _REV6[(tri >> (6 * g)) & 63]) for g in range(groups))
+
+
+def decode_graph6(s: str) -> list[int]:
+    """Neighbour bitmasks of the graph in the graph6 string s."""
+    s = s.strip()
+    if s.startswith(">>graph6<<"):
+        s = s[10:]
+    n, start = _decode_n(s)
+    tri = 0
+    for g, ch in enumerate(s[start:]):
+        tri |= _REV6[ord(ch) - 63] << (6 * g)
+    adj = [0] * n
+    off = 0
+    for j in range(1, n):
+        col = (tri >> off) & ((1 << j) - 1)
+        adj[j] |= col
+        for u in iter_bits(col):
+            adj[u] |= 1 << j
+        off += j
+    return adj
+
+
+def decode_sparse6(s: str) -> list[int]:
+    """Neighbour bitmasks of the graph in the sparse6 string s (loops and repeated edges dropped)."""
+    s = s.strip()
+    if s.startswith(">>sparse6<<"):
+        s = s[11:]
+    n, start = _decode_n(s[1:])
+    k = max(1, (n - 1).bit_length())
+    adj = [0] * n
+    # read (b, x) pairs, 1 + k bits each, from the 6-bit groups
+    acc = 0
+    nbits = 0
+    v = 0
+    for ch in s[1 + start:]:
+        acc = (acc << 6) | (ord(ch) - 63)
+        nbits += 6
+        while nbits >= k + 1:
+            nbits -= k + 1
+            b = (acc >> (nbits + k)) & 1
+            x = (acc >> nbits) & ((1 << k) - 1)
+            acc &= (1 << nbits) - 1
+            if b:
+                v += 1
+            # padding with ones can run past the last vertex
+            if x >= n or v >= n:
+                return adj
+            if x > v:
+                v = x
+            elif x != v:
+                adj[x] |= 1 << v
+                adj[v] |= 1 << x
+    return adj
+
+
+def encode_sparse6(adj: list[int]) -> str:
+    """sparse6 string (without header or newline) of the graph adj."""
+    n = len(adj)
+    k = max(1, (n - 1).bit_length())
+    # (b, x) records of 1 + k bits, accumulated in one int
+    acc = 0
+    nbits = 0
+    cur = 0
+    for v in range(n):
+        for u in iter_bits(adj[v] & ((1 << v) - 1)):
+            if v == cur:
+                acc = (acc << (k + 1)) | u
+            elif v == cur + 1:
+                cur = v
+                acc = (acc << (k + 1)) | (1 << k) | u
+            else:
+                # jump to v, then the edge (u, v)
+                cur = v
+                acc = (((acc << (k + 1)) | (1 << k) | v) << (k + 1)) | u
+                nbits += k + 1
+            nbits += k + 1
+    pad = -nbits % 6
+    if k < 6 and n == 1 << k and pad >= k and cur < n - 1:
+        # padding of ones would read as an edge to vertex n - 1
+        acc <<= 1
+        nbits += 1
+        pad -= 1
+    acc = (acc << pad) | ((1 << pad) - 1)
+    nbits += pad
+    return ":" + _encode_n(n) + "".join(chr(63 + ((acc >> s) & 63)) for s in range(nbits - 6, -1, -6))
+
+
+def decode(s: str) -> list[int]:
+    """Neighbour bitmasks of a graph6 or sparse6 string."""
+    s = s.strip()
+    if s[0] == ":" or s.startswith(">>sparse6<<"):
+        return decode_sparse6(s)
+    return decode_graph6(s)
+
+
+def encode(adj: list[int], fmt: str = "graph6") -> str:
+    """graph6 or sparse6 string of adj; fmt="auto" picks the shorter."""
+    if fmt == "graph6":
+        return encode_graph6(adj)
+    if fmt == "sparse6":
+        return encode_sparse6(adj)
+    if fmt != "auto":
+        raise ValueError("Invalid fmt. Choose from 'graph6', 'sparse6' or 'auto'.")
+    n = len(adj)
+    e = sum(a.bit_count() for a in adj) // 2
+    k = max(1, (n - 1).bit_length())
+    # sparse6 needs at most 2(k + 1) bits per edge, graph6 n(n-1)/2 in all
+    if 2 * e * (k + 1) < n * (n - 1) // 2:
+        return encode_sparse6(adj)
+    return encode_graph6(adj)
+
+
+def _is_edge_list(line: str) -> bool:
+    """
+    True for a Python edge list.  '[' also opens every 28-vertex graph6
+    string, but graph6 never contains '(', ',' or a space.
+    """
+    return line[0] == "[" and (line == "[]" or any(c in line for c in "(, "))
+
+
+def read_graphs(lines: Iterable[str]) -> Iterator[list[int]]:
+    """
+    Neighbour bitmasks of the graphs in a stream with one graph per line:
+    graph6 or sparse6 (with or without header), or a Python edge list
+    such as "[(0, 1), (1, 2)]" on vertices 0..max, optionally preceded by
+    the vertex count ("5: [(0, 1), (1, 2)]") to keep isolated vertices.
+    Blank lines and lines starting with '#' are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line[0] == ":" or line.startswith(">>sparse6<<"):
+            yield decode_sparse6(line)
+            continue
+        n, sep, rest = line.partition(":")
+        if not sep and not _is_edge_list(line):
+            yield decode_graph6(line)
+            continue
+        edges = ast.literal_eval(rest if sep else line)
+        n = int(n) if sep else 0
+        adj = [0] * max([n] + [max(p) + 1 for p in edges])
+        for u, w in edges:
+            adj[u] |= 1 << w
+            adj[w] |= 1 << u
+        yield adj
+
+
+# ------------------------------------------------------------------
+# Files
+# ------------------------------------------------------------------
+def iter_file(path: str) -> Iterator[list[int]]:
+    """Stream the graphs of a file (see read_graphs); '-' reads stdin."""
+    if path == "-":
+        yield from read_graphs(sys.stdin)
+        return
+    with open(path) as fh:
+        yield from read_graphs(fh)
+
+
+class GraphWriter:
+    """
+    Write graphs (neighbour bitmasks) one per line to a path or an open
+    text file, in graph6, sparse6 or per-graph shorter ("auto") format.
+
+        with GraphWriter("out.g6") as w:
+            for adj in graphs:
+                w.write(adj)
+    """
+
+    def __init__(self, out: str | IO[str], fmt: str = "graph6", header: bool = False):
+        encode([0], fmt)            # validate fmt
+        self.fmt = fmt
+        self._own = isinstance(out, str)
+        self.fh = open(out, "w") if self._own else out
+        self.count = 0
+        if header and fmt != "auto":
+            self.fh.write(f">>{fmt}<<")
+
+    def write(self, adj: list[int]) -> None:
+        self.fh.write(encode(adj, self.fmt) + "\n")
+        self.count += 1
+
+    def write_all(self, graphs: Iterable[list[int]]) -> int:
+        for adj in graphs:
+            self.write(adj)
+        return self.count
+
+    def close(self) -> None:
+        if self._own:
+            self.fh.close()
+        else:
+            self.fh.flush()
+
+    def __enter__(self) -> "GraphWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Catalogue:
+    """
+    Read-only random access to a graph6 / sparse6 file through mmap.
+
+    The start offset of every line is found once with one vectorised
+    scan for newlines and saved as FILE.idx.npy (rebuilt when the file is
+    newer), so len(), cat[i], cat[i:j] and cat.line(i) touch only the
+    bytes of the lines they return.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.starts = self._index(size)
+
+    def _index(self, size: int) -> np.ndarray:
+        """Offsets of the line starts, plus one past the end of the file."""
+        idx = self.path + ".idx.npy"
+        if os.path.exists(idx) and os.path.getmtime(idx) >= os.path.getmtime(self.path):
+            starts = np.load(idx, mmap_mode="r")
+            if len(starts) and starts[-1] in (size, size + 1):
+                return starts
+        data = np.frombuffer(self._mm, dtype=np.uint8)
+        ends = np.flatnonzero(data == 10)
+        if size and data[-1] != 10:
+            ends = np.append(ends, size)
+        starts = np.concatenate([[0], ends + 1]).astype(np.int64)
+        try:
+            np.save(idx, starts)
+        except OSError:             # read-only location: keep the index in memory
+            pass
+        return starts
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def line(self, i: int) -> str:
+        """The i-th line, without newline (and without a file header)."""
+        s = self._mm[self.starts[i]:self.starts[i + 1] - 1].decode().strip()
+        if s.startswith(">>"):
+            s = s[s.index("<<") + 2:]
+        return s
+
+    def lines(self, start: int = 0, stop: int | None = None) -> list[str]:
+        stop = len(self) if stop is None else stop
+        return [self.line(i) for i in range(start, stop)]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [decode(self.line(j)) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("catalogue index out of range")
+        return decode(self.line(i))
+
+    def __iter__(self) -> Iterator[list[int]]:
+        for i in range(len(self)):
+            yield decode(self.line(i))
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._fh.close()
+
+    def __enter__(self) -> "Catalogue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
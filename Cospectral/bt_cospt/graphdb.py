@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite catalogue of isomorphism classes.
+
+Every class is stored once, keyed by its canonical certificate, with its
+canonical graph6 string, (v, e), degree sequence and the exact
+characteristic polynomials of A, L = D - A and Q = D + A.  The
+polynomial columns are indexed together with v, so "all cospectral mates
+of G" or "all NDS graphs on 8 vertices" are index lookups instead of a
+re-enumeration.
+
+Usage:
+    python graphdb.py populate 8 12           # store every class with v=8, e=12
+    python graphdb.py populate 8              # ... and every e
+    python graphdb.py mates "Ds_"             # cospectral mates of a graph6 graph
+    python graphdb.py nds 8 [--matrix laplacian]
+    python graphdb.py import database.txt     # graphs from old finder logs
+"""
+
+from __future__ import annotations
+import argparse
+import ast
+import re
+import sqlite3
+from typing import Iterable, Iterator
+
+from bitgraph import BitGraph
+from canonical import canonical_labelling, key_bytes, relabel
+from generate import nonisomorphic_adjacency
+from graph6 import decode_graph6, encode_graph6
+from spectrum import charpoly_keys, chunked
+
+MATRICES = {"adjacency": "adj_key", "laplacian": "lap_key", "signless": "sgn_key"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS graphs (
+    id       INTEGER PRIMARY KEY,
+    canon    BLOB    NOT NULL UNIQUE,   -- vertex count + canonical certificate
+    graph6   TEXT    NOT NULL,          -- graph6 of the canonical labelling
+    v        INTEGER NOT NULL,
+    e        INTEGER NOT NULL,
+    degrees  TEXT    NOT NULL,          -- non-increasing degree sequence
+    adj_key  TEXT    NOT NULL,          -- charpoly coefficients of A
+    lap_key  TEXT    NOT NULL,          -- ... of L = D - A
+    sgn_key  TEXT    NOT NULL           -- ... of Q = D + A
+);
+CREATE INDEX IF NOT EXISTS graphs_ve  ON graphs (v, e);
+CREATE INDEX IF NOT EXISTS graphs_adj ON graphs (v, adj_key);
+CREATE INDEX IF NOT EXISTS graphs_lap ON graphs (v, lap_key);
+CREATE INDEX IF NOT EXISTS graphs_sgn ON graphs (v, sgn_key);
+
+-- (v, e) pairs whose classes are all present
+CREATE TABLE IF NOT EXISTS sweeps (
+    v INTEGER NOT NULL,
+    e INTEGER NOT NULL,
+    PRIMARY KEY (v, e)
+);
+"""
+
+
+def _key_text(key: tuple[int, ...]) -> str:
+    return ",".join(map(str, key))
+
+
+def _column(matrix: str) -> str:
+    if matrix not in MATRICES:
+        raise ValueError("Invalid matrix. Choose from 'adjacency', 'laplacian' or 'signless'.")
+    return MATRICES[matrix]
+
+
+class GraphDB:
+    """Thin wrapper around one SQLite file; use as a context manager."""
+
+    def __init__(self, path: str = "graphs.sqlite"):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "GraphDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    # -------------------------------------------------------------- write
+    def _rows(self, graphs: list[BitGraph]) -> Iterator[tuple]:
+        v = graphs[0].v
+        keys = {m: charpoly_keys(graphs, v, m) for m in MATRICES}
+        for i, g in enumerate(graphs):
+            lab = canonical_labelling(g.nbrs)
+            yield (key_bytes(v, lab.certificate),
+                   encode_graph6(relabel(g.nbrs, lab.lab)),
+                   v, g.size(),
+                   _key_text(sorted(g.degrees(), reverse=True)),
+                   _key_text(keys["adjacency"][i]),
+                   _key_text(keys["laplacian"][i]),
+                   _key_text(keys["signless"][i]))
+
+    def add_graphs(self, graphs: Iterable[BitGraph], chunk: int = 4096) -> int:
+        """Store graphs (any mix of orders); returns the number of new classes."""
+        before = self.conn.total_changes
+        for batch in chunked(graphs, chunk):
+            by_v: dict[int, list[BitGraph]] = {}
+            for g in batch:
+                by_v.setdefault(g.v, []).append(g)
+            for same_v in by_v.values():
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO graphs "
+                    "(canon, graph6, v, e, degrees, adj_key, lap_key, sgn_key) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._rows(same_v))
+        self.conn.commit()
+        return self.conn.total_changes - before
+
+    def populate(self, v: int, e: int, chunk: int = 4096) -> int:
+        """Store every isomorphism class with v vertices and e edges."""
+        graphs = map(BitGraph.from_adjacency, nonisomorphic_adjacency(v, e))
+        added = self.add_graphs(graphs, chunk)
+        self.conn.execute("INSERT OR IGNORE INTO sweeps (v, e) VALUES (?, ?)", (v, e))
+        self.conn.commit()
+        return added
+
+    # -------------------------------------------------------------- read
+    def is_complete(self, v: int, e: int | None = None) -> bool:
+        """Are all classes with v vertices (and e edges, if given) stored?"""
+        if e is not None:
+            row = self.conn.execute("SELECT 1 FROM sweeps WHERE v = ? AND e = ?", (v, e)).fetchone()
+            return row is not None
+        (n,) = self.conn.execute("SELECT COUNT(*) FROM sweeps WHERE v = ?", (v,)).fetchone()
+        return n == v * (v - 1) // 2 + 1
+
+    def count(self, v: int | None = None) -> int:
+        if v is None:
+            return self.conn.execute("SELECT COUNT(*) FROM graphs").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM graphs WHERE v = ?", (v,)).fetchone()[0]
+
+    def lookup(self, g: BitGraph) -> str | None:
+        """Canonical graph6 of g's class if it is stored."""
+        canon = key_bytes(g.v, canonical_labelling(g.nbrs).certificate)
+        row = self.conn.execute("SELECT graph6 FROM graphs WHERE canon = ?", (canon,)).fetchone()
+        return None if row is None else row[0]
+
+    def cospectral_mates(self, g: BitGraph, matrix: str = "adjacency") -> list[str]:
+        """graph6 strings of the stored classes cospectral with, but not isomorphic to, g."""
+        col = _column(matrix)
+        key = _key_text(charpoly_keys([g], g.v, matrix)[0])
+        canon = key_bytes(g.v, canonical_labelling(g.nbrs).certificate)
+        rows = self.conn.execute(
+            f"SELECT graph6 FROM graphs WHERE v = ? AND {col} = ? AND canon <> ? ORDER BY id",
+            (g.v, key, canon))
+        return [r[0] for r in rows]
+
+    def nds(self, v: int, matrix: str = "adjacency") -> list[list[str]]:
+        """Stored classes on v vertices that have a cospectral mate, grouped by spectrum."""
+        col = _column(matrix)
+        rows = self.conn.execute(
+            f"SELECT {col}, graph6 FROM graphs WHERE v = ? AND {col} IN "
+            f"(SELECT {col} FROM graphs WHERE v = ? GROUP BY {col} HAVING COUNT(*) > 1) "
+            f"ORDER BY {col}, id", (v, v))
+        groups: dict[str, list[str]] = {}
+        for key, g6 in rows:
+            groups.setdefault(key, []).append(g6)
+        return list(groups.values())
+
+
+# ------------------------------------------------------------------
+# Import of old finder output (database.txt)
+# ------------------------------------------------------------------
+_HEADER = re.compile(r"^v\s*=\s*(\d+)\s+e\s*=\s*(\d+)")
+_EDGES = re.compile(r"edges=(\[.*\])", re.IGNORECASE)
+
+
+def read_finder_log(path: str) -> Iterator[BitGraph]:
+    """Graphs printed by the cospectral finders, under 'v = .. e = ..' headers."""
+    v = None
+    with open(path) as fh:
+        for line in fh:
+            m = _HEADER.match(line.strip())
+            if m:
+                v = int(m.group(1))
+                continue
+            m = _EDGES.search(line)
+            if m and v is not None:
+                edges = ast.literal_eval(m.group(1))
+                n = max([v] + [max(p) + 1 for p in edges])
+                yield BitGraph.from_edges(n, edges)
+
+
+def _cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default="graphs.sqlite", help="SQLite file")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("populate")
+    p.add_argument("v", type=int)
+    p.add_argument("e", type=int, nargs="?")
+    p = sub.add_parser("mates")
+    p.add_argument("graph6")
+    p.add_argument("--matrix", default="adjacency", choices=MATRICES)
+    p = sub.add_parser("nds")
+    p.add_argument("v", type=int)
+    p.add_argument("--matrix", default="adjacency", choices=MATRICES)
+    p = sub.add_parser("import")
+    p.add_argument("path")
+    args = parser.parse_args()
+
+    with GraphDB(args.db) as db:
+        if args.cmd == "populate":
+            es = range(args.v * (args.v - 1) // 2 + 1) if args.e is None else [args.e]
+            for e in es:
+                print(f"v={args.v} e={e}: {db.populate(args.v, e)} new classes")
+        elif args.cmd == "mates":
+            g = BitGraph.from_adjacency(decode_graph6(args.graph6))
+            if not db.is_complete(g.v, g.size()):
+                print(f"warning: v={g.v} e={g.size()} is not fully populated")
+            for g6 in db.cospectral_mates(g, args.matrix):
+                print(g6)
+        elif args.cmd == "nds":
+            groups = db.nds(args.v, args.matrix)
+            for grp in groups:
+                print(" ".join(grp))
+            print(f"{sum(map(len, groups))} NDS classes in {len(groups)} cospectral sets")
+        else:
+            print(f"{db.add_graphs(read_finder_log(args.path))} new classes")
+
+
+if __name__ == "__main__":
+    _cli()
@@ -1 +1,273 @@
-# __for update__
+#!/usr/bin/env python3
+"""
+Batched adjacency spectra for the cospectral sweep.
+
+Instead of one v×v matrix and one `eigvalsh` call per candidate, a whole
+chunk of candidates with the same v is packed into one (N, v, v) array
+and diagonalised by a single stacked `eigvalsh` call.  Spectrum keys
+come back as one contiguous (N, v) float64 array; slicing its raw bytes
+gives hashable per-graph keys without any per-graph NumPy call.
+
+Every function takes a sequence of graphs given either as edge sets of
+equal size, as edge bitmasks over combinations(range(v), 2), or as
+`BitGraph`s (see bitgraph.py).
+"""
+
+from __future__ import annotations
+from itertools import islice
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most `size` items."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _edge_masks(graphs: Sequence) -> Sequence[int] | None:
+    """Edge bitmasks of `graphs`, or None when they are edge sets."""
+    first = graphs[0]
+    if isinstance(first, int):
+        return graphs
+    if isinstance(getattr(first, "edges", None), int):
+        return [g.edges for g in graphs]
+    return None
+
+
+def adjacency_stack(graphs: Sequence, v: int) -> np.ndarray:
+    """(N, v, v) float64 adjacency matrices of N graphs on range(v)."""
+    N = len(graphs)
+    A = np.zeros((N, v, v), dtype=np.float64)
+    if N == 0 or v < 2:
+        return A
+    masks = _edge_masks(graphs)
+    if masks is not None:
+        # unpack all masks at once; bit i is the i-th pair, which is also
+        # the i-th entry of the row-major upper triangle
+        m = v * (v - 1) // 2
+        nb = (m + 7) // 8
+        raw = b"".join(x.to_bytes(nb, "little") for x in masks)
+        bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8).reshape(N, nb),
+                             axis=1, bitorder="little")[:, :m]
+        iu, ju = np.triu_indices(v, 1)
+        A[:, iu, ju] = bits
+        A[:, ju, iu] = bits
+        return A
+    if not graphs[0]:
+        return A
+    E = np.asarray(graphs, dtype=np.intp)             # (N, e, 2)
+    rows = np.arange(N)[:, None]
+    A[rows, E[:, :, 0], E[:, :, 1]] = 1.0
+    A[rows, E[:, :, 1], E[:, :, 0]] = 1.0
+    return A
+
+
+def spectrum_key_array(graphs: Sequence, v: int,
+                       decimals: int = 8) -> np.ndarray:
+    """Contiguous (N, v) array of sorted adjacency spectra, rounded."""
+    vals = np.linalg.eigvalsh(adjacency_stack(graphs, v))
+    # adding 0.0 turns -0.0 into 0.0 so equal spectra have equal bytes
+    return np.ascontiguousarray(np.round(vals, decimals) + 0.0)
+
+
+def spectrum_keys(graphs: Sequence, v: int,
+                  decimals: int = 8) -> list[bytes]:
+    """Hashable spectrum key (raw bytes of the rounded spectrum) per graph."""
+    raw = spectrum_key_array(graphs, v, decimals).tobytes()
+    w = 8 * v
+    if w == 0:
+        return [b""] * len(graphs)
+    return [raw[i:i + w] for i in range(0, len(raw), w)]
+
+
+# ------------------------------------------------------------------
+# Cheap exact invariants: closed-walk counts
+# ------------------------------------------------------------------
+def walk_invariants(graphs: Sequence, v: int,
+                    kmax: int = 4) -> list[tuple[int, ...]]:
+    """
+    (tr A^3, ..., tr A^kmax) per graph, from integer matrix powers.
+
+    tr A^k counts closed walks of length k (tr A^3 = 6 * #triangles) and is
+    determined by the spectrum, so graphs with different tuples can never
+    be cospectral.  Much cheaper than a full spectrum for kmax << v.
+    """
+    return power_traces(graphs, v, "adjacency", 3, kmax)
+
+
+def power_traces(graphs: Sequence, v: int, matrix: str = "adjacency",
+                 kmin: int = 2, kmax: int = 4) -> list[tuple[int, ...]]:
+    """
+    (tr M^kmin, ..., tr M^kmax) per graph for an integer matrix M (see
+    `integer_stack`).  Spectral invariants like `walk_invariants`; for
+    L and Q, tr M^2 = sum(d_i^2) + 2e already splits a degree class.
+    """
+    M = integer_stack(graphs, v, matrix)
+    if M.shape[0] == 0:
+        return []
+    cols = []
+    P = M                                   # P = M^(k-1) below
+    for _ in range(kmin - 2):
+        P = P @ M
+    for k in range(kmin, kmax + 1):
+        # tr(P M) without forming P M: sum of the elementwise product
+        cols.append(np.einsum("nij,nji->n", P, M))
+        if k < kmax:
+            P = P @ M
+    if not cols:
+        return [()] * M.shape[0]
+    return [tuple(row) for row in np.stack(cols, axis=1).tolist()]
+
+
+# ------------------------------------------------------------------
+# Exact keys: integer characteristic polynomial
+# ------------------------------------------------------------------
+# Faddeev–LeVerrier stays inside int64 up to these orders (the Laplacian
+# matrices have entries up to v-1, so their coefficients grow faster: K16
+# already overflows L and Q); beyond that the object dtype keeps it exact.
+_INT64_MAX_V = {"adjacency": 20, "laplacian": 15, "signless": 15,
+                "seidel": 20, "complement": 20}
+
+# every matrix the finders can key on; "normalized" (I - D^-1/2 A D^-1/2)
+# has irrational entries, so it is only keyed by its rounded spectrum
+MATRICES = tuple(_INT64_MAX_V) + ("normalized",)
+
+
+def _from_adjacency(A: np.ndarray, D: np.ndarray, matrix: str) -> np.ndarray:
+    """
+    A, L = D - A ("laplacian"), Q = D + A ("signless"), the Seidel matrix
+    S = J - I - 2A ("seidel") or the complement's adjacency J - I - A
+    ("complement"), from an int64 adjacency stack and its degrees.
+    """
+    if matrix == "adjacency":
+        return A
+    v = A.shape[-1]
+    idx = np.arange(v)
+    if matrix in ("laplacian", "signless"):
+        M = -A if matrix == "laplacian" else A.copy()
+        M[:, idx, idx] = D
+        return M
+    M = 1 - (2 if matrix == "seidel" else 1) * A
+    M[:, idx, idx] = 0
+    return M
+
+
+def integer_stack(graphs: Sequence, v: int, matrix: str = "adjacency") -> np.ndarray:
+    """
+    (N, v, v) int64 stack of one of the integer matrices of `_from_adjacency`,
+    sharing one adjacency stack and degree vector.
+    """
+    A = adjacency_stack(graphs, v).astype(np.int64)
+    return _from_adjacency(A, A.sum(axis=2), matrix)
+
+
+def _check_integer(matrix: str) -> None:
+    if matrix not in _INT64_MAX_V:
+        raise ValueError("Invalid matrix. Choose from 'adjacency', 'laplacian', "
+                         "'signless', 'seidel' or 'complement'.")
+
+
+def charpoly_array(graphs: Sequence, v: int, matrix: str = "adjacency") -> np.ndarray:
+    """
+    (N, v) integer array of characteristic-polynomial coefficients.
+
+    Row i holds c_{v-1}, ..., c_0 of det(xI - M_i) = x^v + c_{v-1} x^{v-1}
+    + ... + c_0, computed by Faddeev–LeVerrier on the whole stack: exact,
+    so cospectral graphs always share a row and others never do.
+    `matrix` is "adjacency", "laplacian", "signless", "seidel" or
+    "complement".
+    """
+    _check_integer(matrix)
+    return _charpoly(integer_stack(graphs, v, matrix), v <= _INT64_MAX_V[matrix])
+
+
+def _charpoly(M: np.ndarray, small: bool) -> np.ndarray:
+    """Faddeev–LeVerrier on an int64 stack; object dtype unless `small`."""
+    dtype = np.int64 if small else object
+    A = M.astype(dtype)
+    v = A.shape[-1]
+    coeffs = np.zeros((A.shape[0], v), dtype=dtype)
+    I = np.eye(v, dtype=np.int64).astype(dtype)
+    M = np.broadcast_to(I, A.shape).copy()      # M_1 = I
+    for k in range(1, v + 1):
+        AM = A @ M
+        c = -np.trace(AM, axis1=1, axis2=2) // k
+        coeffs[:, k - 1] = c
+        M = AM + c[:, None, None] * I
+    return coeffs
+
+
+def charpoly_keys(graphs: Sequence, v: int, matrix: str = "adjacency") -> list[tuple[int, ...]]:
+    """Exact spectrum key (characteristic polynomial coefficients) per graph."""
+    return [tuple(row) for row in charpoly_array(graphs, v, matrix).tolist()]
+
+
+# ------------------------------------------------------------------
+# Several matrices in one pass
+# ------------------------------------------------------------------
+def normalized_laplacian_stack(A: np.ndarray, D: np.ndarray) -> np.ndarray:
+    """I - D^-1/2 A D^-1/2 per graph; rows of isolated vertices are zero."""
+    d = np.zeros(D.shape, dtype=np.float64)
+    np.divide(1.0, np.sqrt(D), out=d, where=D > 0)
+    L = -(d[:, :, None] * A * d[:, None, :])
+    idx = np.arange(A.shape[-1])
+    L[:, idx, idx] = (D > 0)
+    return L
+
+
+def spectrum_arrays(graphs: Sequence, v: int,
+                    matrices: Sequence[str] = ("adjacency", "laplacian")) -> dict[str, np.ndarray]:
+    """
+    Sorted (N, v) float64 spectra for each matrix in `matrices` (see
+    MATRICES), from one adjacency stack and degree vector.
+    """
+    A = adjacency_stack(graphs, v).astype(np.int64)
+    return _spectra(A, A.sum(axis=2), matrices)
+
+
+def _spectra(A: np.ndarray, D: np.ndarray, matrices: Sequence[str]) -> dict[str, np.ndarray]:
+    out = {}
+    for m in matrices:
+        if m == "normalized":
+            out[m] = np.linalg.eigvalsh(normalized_laplacian_stack(A, D))
+        else:
+            _check_integer(m)
+            out[m] = np.linalg.eigvalsh(_from_adjacency(A, D, m).astype(np.float64))
+    return out
+
+
+def matrix_keys(graphs: Sequence, v: int, matrices: Sequence[str],
+                exact: bool = True, decimals: int = 8) -> dict[str, list]:
+    """
+    One spectrum key per graph for each matrix in `matrices` (see
+    MATRICES), all built from a single adjacency stack and degree vector.
+
+    With `exact`, integer matrices are keyed by their characteristic
+    polynomial (raw int64 bytes of the coefficient row while they fit,
+    tuples beyond); otherwise, and always for "normalized", by the raw
+    bytes of the rounded sorted spectrum.
+    """
+    for m in matrices:
+        if m != "normalized":
+            _check_integer(m)
+    A = adjacency_stack(graphs, v).astype(np.int64)
+    D = A.sum(axis=2)
+    keys = {}
+    for m in matrices:
+        if not exact or m == "normalized":
+            vals = _spectra(A, D, [m])[m]
+            raw = np.ascontiguousarray(np.round(vals, decimals) + 0.0)
+            keys[m] = [row.tobytes() for row in raw]
+            continue
+        coeffs = _charpoly(_from_adjacency(A, D, m), v <= _INT64_MAX_V[m])
+        if coeffs.dtype == np.int64:
+            keys[m] = [row.tobytes() for row in coeffs]
+        else:
+            keys[m] = [tuple(row) for row in coeffs.tolist()]
+    return keys
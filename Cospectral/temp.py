@@ -1,6 +1,14 @@
+import os
+import sys
+from itertools import combinations, groupby
+
 import networkx as nx
 import numpy as np
-from itertools import combinations, groupby
+
+_BT_COSPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bt_cospt")
+if _BT_COSPT not in sys.path:
+    sys.path.append(_BT_COSPT)
+from spectrum import charpoly_keys  # noqa: E402
 
 def find_cospectral_nonisomorphic_graphs(v, e):
     """
@@ -28,18 +36,15 @@ def find_cospectral_nonisomorphic_graphs(v, e):
     possible_edges = combinations(nodes, 2)
     
     # 1. Generate all unique graphs with v nodes and e edges
-    all_graphs = [nx.Graph(edge_list) for edge_list in combinations(possible_edges, e)]
+    edge_lists = list(combinations(possible_edges, e))
+    all_graphs = [nx.Graph(edge_list) for edge_list in edge_lists]
     
-    # 2. Calculate the spectrum for each graph.
-    # We round the eigenvalues and convert to a tuple to make them hashable for grouping.
-    def get_spectrum_tuple(G):
-        A = nx.to_numpy_array(G)
-        eigenvalues = np.linalg.eigvalsh(A)
-        return tuple(np.round(eigenvalues, decimals=8))
-
+    # 2. Calculate the spectrum key for each graph.
+    # Exact integer characteristic polynomial (spectrum.charpoly_keys), so
+    # no rounding can split or merge cospectral groups.
     # Pair each graph with its spectrum
     print("pairing....")
-    graphs_with_spectra = [(G, get_spectrum_tuple(G)) for G in all_graphs]
+    graphs_with_spectra = list(zip(all_graphs, charpoly_keys(edge_lists, v)))
 
     # 3. Group graphs by their spectrum
     # Sort by spectrum first to ensure groupby works correctly
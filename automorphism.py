@@ -0,0 +1,97 @@
+import os
+import sys
+
+import networkx as nx
+
+# Partition refinement + individualisation search from Cospectral/bt_cospt
+# (pure Python, bitset adjacency); see canonical.py there.
+_BT_COSPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cospectral", "bt_cospt")
+if _BT_COSPT not in sys.path:
+    sys.path.append(_BT_COSPT)
+from canonical import bitset_adjacency, canonical_labelling  # noqa: E402
+
+# Automorphisms of bipartite graphs.
+#
+# Aut(G) is computed by the canonical-labelling search: the vertex
+# partition is refined to an equitable one, cells are individualised,
+# and every pair of leaves with the same certificate gives an
+# automorphism; the generators it records generate the whole group.
+#
+# For a connected bipartite G with parts X, Y every automorphism either
+# fixes both parts or exchanges them, and the part-fixing automorphisms
+# form a subgroup of index 1 or 2.  So Aut(G) contains a part swap iff
+# one of its generators swaps the parts.
+
+
+# ---------- Group ----------
+def _indexed(G):
+    """(nodes, bitset adjacency over range(len(nodes)))."""
+    nodes = list(G.nodes())
+    index = {u: i for i, u in enumerate(nodes)}
+    return nodes, bitset_adjacency(len(nodes), ((index[u], index[w]) for u, w in G.edges()))
+
+
+def automorphism_generators(G, cells=None):
+    """
+    Generators of Aut(G), as dicts node -> image.
+
+    Parameters:
+    -----------
+    G : networkx.Graph
+    cells : list of node collections or None
+        Optional ordered partition (colouring) the automorphisms must
+        preserve; by default all nodes start in one cell.
+    """
+    nodes, adj = _indexed(G)
+    if cells is not None:
+        index = {u: i for i, u in enumerate(nodes)}
+        cells = [[index[u] for u in c] for c in cells]
+    lab = canonical_labelling(adj, cells)
+    return [{nodes[i]: nodes[g[i]] for i in range(len(nodes))} for g in lab.generators]
+
+
+def automorphism_orbits(G):
+    """Vertex orbits of Aut(G), as a list of sets of nodes."""
+    nodes, adj = _indexed(G)
+    orbits = {}
+    for i, rep in enumerate(canonical_labelling(adj).orbits):
+        orbits.setdefault(rep, set()).add(nodes[i])
+    return list(orbits.values())
+
+
+# ---------- Part swaps ----------
+def swap_automorphism(G, X=None):
+    """
+    An automorphism of the bipartite graph G mapping the part X onto the
+    other part (as a dict node -> image), or None if there is none.
+
+    X defaults to one side of nx.bipartite.sets(G), which needs G to be
+    connected.  For connected G the answer is read off the generators of
+    Aut(G); for a disconnected G (bipartition given by X) it compares the
+    canonical forms of G coloured (X, Y) and (Y, X), which are equal iff
+    an automorphism takes X to Y.
+    """
+    if X is None:
+        X, _ = nx.bipartite.sets(G)
+    X = set(X)
+    Y = set(G) - X
+    if len(X) != len(Y):
+        return None
+    if nx.is_connected(G):
+        for g in automorphism_generators(G):
+            if g[next(iter(X))] in Y:
+                return g
+        return None
+    nodes, adj = _indexed(G)
+    index = {u: i for i, u in enumerate(nodes)}
+    xs, ys = [index[u] for u in X], [index[u] for u in Y]
+    a = canonical_labelling(adj, [xs, ys])
+    b = canonical_labelling(adj, [ys, xs])
+    if a.certificate != b.certificate:
+        return None
+    return {nodes[u]: nodes[w] for u, w in zip(a.lab, b.lab)}
+
+
+def has_swap_automorphism(G, X=None):
+    """True if some automorphism of the bipartite graph G exchanges its parts."""
+    return swap_automorphism(G, X) is not None
@@ -1,5 +1,6 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+from layout_cache import cached_layout
 
 def T_nk(n, k):
     """
@@ -30,7 +31,7 @@ def draw_Tnk(n, k):
     """Draws T_{n,k} graph with labels."""
     G = T_nk(n, k)
     plt.figure(figsize=(5, 5))
-    pos = nx.spring_layout(G, seed=42)  # layout for nice visualization
+    pos = cached_layout(G, "spring", seed=42)  # cached per T_{n,k} (layout_cache.py)
     nx.draw(G, pos, with_labels=True, node_color="skyblue",
             node_size=700, font_size=12, edge_color="gray")
     plt.title(f"T_{{{n},{k}}} Graph", fontsize=14)
@@ -1,5 +1,6 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+from layout_cache import cached_layout
 
 def T_nk(n, k):
     """
@@ -36,7 +37,7 @@ def draw_Tnk_colored(n, k):
     G, clique_edges, join_edges = T_nk(n, k)
     
     plt.figure(figsize=(6, 6))
-    pos = nx.spring_layout(G, seed=42)
+    pos = cached_layout(G, "spring", seed=42)  # cached per T_{n,k} (layout_cache.py)
     
     # Draw nodes
     nx.draw_networkx_nodes(G, pos, node_color="skyblue", node_size=700)
@@ -5,6 +5,7 @@ from sage.all_cmdline import *   # import sage library
 
 _sage_const_1 = Integer(1); _sage_const_3 = Integer(3)
 from itertools import product
+from hamming_draw import hamming_edges, hamming_spectrum
 
 def HammingGraph(d, q):
     # vertices = all d-tuples over {0,...,q-1}
@@ -14,15 +15,17 @@ def HammingGraph(d, q):
     G = Graph(multiedges=False, loops=False)
     G.add_vertices(vertices)
 
-    # add edges: differ in exactly one coordinate
-    for i, u in enumerate(vertices):
-        for v in vertices[i+_sage_const_1 :]:
-            diff = sum(_sage_const_1  for j in range(d) if u[j] != v[j])
-            if diff == _sage_const_1 :
-                G.add_edge(u, v)
+    # add edges: the neighbours of each vertex come from index arithmetic
+    # (see hamming_draw.py), no vertex pairs are compared
+    rows, cols = hamming_edges(int(d), int(q))
+    G.add_edges((vertices[i], vertices[j]) for i, j in zip(rows.tolist(), cols.tolist()))
 
     return G
 
+def HammingSpectrum(d, q):
+    # closed form: d(q-1) - q i with multiplicity C(d, i) (q-1)^i
+    return hamming_spectrum(int(d), int(q))
+
 # Example: H(3,3)
 # Example: H(3,3)
 G = HammingGraph(_sage_const_3 , _sage_const_3 )
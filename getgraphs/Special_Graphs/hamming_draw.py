@@ -1,45 +1,95 @@
 import networkx as nx
 import itertools
+from math import comb
+
+import numpy as np
+import scipy.sparse as sp
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
+# Vertices of H(d, q) are the d-tuples over range(q), numbered in
+# itertools.product order: (a_0, ..., a_{d-1}) -> sum_j a_j q^(d-1-j).
+# Changing coordinate j from a to b moves the index by (b - a) q^(d-1-j),
+# so the d(q-1) neighbours of every vertex are pure index arithmetic.
+
+def hamming_adjacency(d, q, dtype=np.int8):
+    """
+    Sparse adjacency matrix (CSR, q^d x q^d) of the Hamming graph H(d, q).
+
+    Built directly from index arithmetic, without comparing vertex pairs:
+    O(q^d d q) time and memory.
+    """
+    N = q ** d
+    idx = np.arange(N, dtype=np.int64)
+    cols = []
+    for j in range(d):
+        stride = q ** (d - 1 - j)
+        a = (idx // stride) % q
+        for t in range(1, q):
+            cols.append(idx + (((a + t) % q) - a) * stride)
+    deg = d * (q - 1)
+    indices = np.sort(np.stack(cols, axis=1), axis=1).ravel() if cols else np.zeros(0, dtype=np.int64)
+    indptr = np.arange(N + 1, dtype=np.int64) * deg
+    return sp.csr_array((np.ones(N * deg, dtype=dtype), indices, indptr), shape=(N, N))
+
+
+def hamming_edges(d, q):
+    """(i, j) index arrays, i < j, of the edges of H(d, q)."""
+    A = sp.triu(hamming_adjacency(d, q), k=1).tocoo()
+    return A.row, A.col
+
+
 def hamming_graph(d, q):
-    G = nx.Graph()
+    """H(d, q) as a networkx graph on the d-tuples over range(q)."""
     vertices = list(itertools.product(range(q), repeat=d))
+    G = nx.Graph()
     G.add_nodes_from(vertices)
-    for i, u in enumerate(vertices):
-        for v in vertices[i+1:]:
-            diff = sum(1 for j in range(d) if u[j] != v[j])
-            if diff == 1:
-                G.add_edge(u, v)
+    rows, cols = hamming_edges(d, q)
+    G.add_edges_from((vertices[i], vertices[j]) for i, j in zip(rows.tolist(), cols.tolist()))
     return G
 
-q=4
-# Example: H(3,2) is a cube
-G = hamming_graph(3, q)
 
-# Get 3D coordinates from node labels directly (since tuples are coordinates)
-pos = {node: node for node in G.nodes()}
+def hamming_spectrum(d, q):
+    """
+    Adjacency spectrum of H(d, q) in closed form, as (eigenvalue, multiplicity)
+    pairs, largest eigenvalue first: d(q-1) - q i with multiplicity
+    C(d, i) (q-1)^i for i = 0..d.  Exact integers, for any d and q.
+    """
+    return [(d * (q - 1) - q * i, comb(d, i) * (q - 1) ** i) for i in range(d + 1)]
+
+
+def hamming_eigenvalues(d, q):
+    """All q^d adjacency eigenvalues of H(d, q), sorted ascending (float64)."""
+    vals, mult = zip(*hamming_spectrum(d, q))
+    return np.repeat(np.array(vals[::-1], dtype=float), mult[::-1])
+
+
+if __name__ == "__main__":
+    q=4
+    # Example: H(3,2) is a cube
+    G = hamming_graph(3, q)
 
-# Plot in 3D
-fig = plt.figure(figsize=(6,6))
-ax = fig.add_subplot(111, projection='3d')
+    # Get 3D coordinates from node labels directly (since tuples are coordinates)
+    pos = {node: node for node in G.nodes()}
 
-# Draw edges
-for (u, v) in G.edges():
-    x = [pos[u][0], pos[v][0]]
-    y = [pos[u][1], pos[v][1]]
-    z = [pos[u][2], pos[v][2]]
-    ax.plot(x, y, z, color='black')
+    # Plot in 3D
+    fig = plt.figure(figsize=(6,6))
+    ax = fig.add_subplot(111, projection='3d')
 
-# Draw nodes
-xs, ys, zs = zip(*pos.values())
-ax.scatter(xs, ys, zs, s=100, c='skyblue', edgecolors='black')
+    # Draw edges
+    for (u, v) in G.edges():
+        x = [pos[u][0], pos[v][0]]
+        y = [pos[u][1], pos[v][1]]
+        z = [pos[u][2], pos[v][2]]
+        ax.plot(x, y, z, color='black')
 
-# Label nodes
-for node in G.nodes():
-    ax.text(pos[node][0], pos[node][1], pos[node][2], str(node), size=10)
+    # Draw nodes
+    xs, ys, zs = zip(*pos.values())
+    ax.scatter(xs, ys, zs, s=100, c='skyblue', edgecolors='black')
 
-ax.set_title("Hamming Graph H(3,2) - Cube")
-plt.show()
+    # Label nodes
+    for node in G.nodes():
+        ax.text(pos[node][0], pos[node][1], pos[node][2], str(node), size=10)
 
+    ax.set_title("Hamming Graph H(3,2) - Cube")
+    plt.show()
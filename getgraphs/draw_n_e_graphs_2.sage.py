@@ -5,22 +5,32 @@ from sage.all_cmdline import *   # import sage library
 
 _sage_const_7 = Integer(7); _sage_const_6 = Integer(6)
 import os
+from graph_enum import enumerate_graphs
+from spectral_catalogue import write_catalogue
 
 n = _sage_const_7       # number of vertices
 e = _sage_const_6       # number of edges
 folder = f"graphs_{n}_{e}edges"
+# "catalogue": one memory-mappable .npy with graph6, degree sequence and
+# A / L / Q spectra of every graph (see spectral_catalogue.py), no PNGs;
+# "files": one PNG and one .txt per graph
+output = "files"
 
 # Create folder if it doesn’t exist
 os.makedirs(folder, exist_ok=True)
 
-# Generate all non-isomorphic graphs with n vertices
-Gs = list(graphs(n))
+if output == "catalogue":
+    path = os.path.join(folder, f"graphs_{n}_{e}edges.npy")
+    count = write_catalogue(int(n), int(e), path)
+    print(f"Total graphs with {n} vertices and {e} edges: {count}, saved {path}")
+    raise SystemExit
 
-# Filter by number of edges
-Gs_filtered = [G for G in Gs if G.size() == e]
-
-print(f"Total graphs with {n} vertices and {e} edges: {len(Gs_filtered)}")
+# Stream the non-isomorphic graphs with n vertices and e edges
+# (graph_enum.py: the edge count prunes the generation, no full list)
+Gs_filtered = (Graph([list(range(n)), edges], format='vertices_and_edges')
+               for edges in enumerate_graphs(int(n), int(e)))
 
+i = -1
 for i, G in enumerate(Gs_filtered):
     # --- Save PNG image ---
     P = G.plot()
@@ -61,4 +71,6 @@ for i, G in enumerate(Gs_filtered):
 
     print(f"Saved {img_file} and {txt_file}")
 
+print(f"Total graphs with {n} vertices and {e} edges: {i + 1}")
+
 
@@ -5,21 +5,34 @@ from sage.all_cmdline import *   # import sage library
 
 _sage_const_8 = Integer(8)
 import os
+from graph_enum import enumerate_graph6, enumerate_graphs
+from render_graphs import render_graphs
 
 n = _sage_const_8    # number of vertices
 folder = f"graphs_{n}"   # folder name depends on n
 
+# "pool": matplotlib Agg in a process pool (render_graphs.py), much faster;
+# "sage": G.plot().save() one graph at a time
+renderer = "pool"
+sheet = None     # e.g. (10, 10): contact sheets of 100 graphs per PNG (pool only)
+
 # Create the folder if it doesn’t exist
 os.makedirs(folder, exist_ok=True)
 
-# Generate all non-isomorphic graphs with n vertices
-Gs = list(graphs(n))
-print(f"Total non-isomorphic graphs on {n} vertices: {len(Gs)}")
+if renderer == "pool":
+    count = render_graphs(enumerate_graph6(int(n)), folder, prefix=f"graph_{n}", sheet=sheet)
+    print(f"Total non-isomorphic graphs on {n} vertices: {count}")
+    raise SystemExit
+
+# Stream the non-isomorphic graphs with n vertices (graph_enum.py)
+Gs = (Graph([list(range(n)), edges], format='vertices_and_edges')
+      for edges in enumerate_graphs(int(n)))
 
 # Draw and save each graph
+i = -1
 for i, G in enumerate(Gs):
     P = G.plot()
     filename = os.path.join(folder, f"graph_{n}_{i}.png")
     P.save(filename)
     print(f"Saved {filename}")
-
+print(f"Total non-isomorphic graphs on {n} vertices: {i + 1}")
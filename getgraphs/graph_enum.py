@@ -0,0 +1,71 @@
+"""
+Non-isomorphic graphs without Sage.
+
+Streams one graph per isomorphism class on n vertices from the
+canonical-augmentation generator in Cospectral/bt_cospt/generate.py, a
+drop-in for `graphs(n)` in the .sage scripts here that never holds the
+whole list in memory.  Edge count, degree bounds and connectivity are
+pruned during generation, not filtered afterwards.
+
+Usage:
+    python graph_enum.py 7 --edges 6                  # graph6, one per line
+    python graph_enum.py 12 --max-degree 3 --format sparse6 > sparse12.s6
+    python graph_enum.py 10 --connected --max-degree 3 > subcubic10.g6
+    python graph_enum.py 10 --count
+"""
+import argparse
+import os
+import sys
+
+_BT_COSPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Cospectral", "bt_cospt")
+if _BT_COSPT not in sys.path:
+    sys.path.append(_BT_COSPT)
+from generate import nonisomorphic_adjacency, nonisomorphic_graphs  # noqa: E402
+from graph6 import GraphWriter, encode_graph6  # noqa: E402
+
+
+def enumerate_graphs(n, e=None, min_degree=0, max_degree=None, connected=False):
+    """
+    Yield the edge lists [(u, w), ...] (u < w, vertices 0..n-1) of all
+    non-isomorphic graphs on n vertices, optionally with exactly e edges,
+    degrees in [min_degree, max_degree], and/or connected.
+    """
+    for edges in nonisomorphic_graphs(n, e, min_degree=min_degree,
+                                      max_degree=max_degree, connected=connected):
+        yield list(edges)
+
+
+def enumerate_adjacency(n, e=None, min_degree=0, max_degree=None, connected=False):
+    """Same graphs as enumerate_graphs, as neighbour bitmasks (see graph6.py)."""
+    return nonisomorphic_adjacency(n, e, min_degree=min_degree,
+                                   max_degree=max_degree, connected=connected)
+
+
+def enumerate_graph6(n, e=None, min_degree=0, max_degree=None, connected=False):
+    """Same graphs as enumerate_graphs, as graph6 strings."""
+    for adj in enumerate_adjacency(n, e, min_degree, max_degree, connected):
+        yield encode_graph6(adj)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enumerate non-isomorphic graphs on n vertices (graph6/sparse6 to stdout).")
+    parser.add_argument("n", type=int, help="number of vertices")
+    parser.add_argument("-e", "--edges", type=int, help="only graphs with this many edges")
+    parser.add_argument("--min-degree", type=int, default=0)
+    parser.add_argument("--max-degree", type=int)
+    parser.add_argument("--connected", action="store_true")
+    parser.add_argument("--format", default="graph6", choices=("graph6", "sparse6", "auto"),
+                        help="output format (auto: the shorter one per graph)")
+    parser.add_argument("--count", action="store_true", help="print only the number of graphs")
+    args = parser.parse_args()
+
+    graphs = enumerate_adjacency(args.n, args.edges, args.min_degree, args.max_degree, args.connected)
+    if args.count:
+        print(sum(1 for _ in graphs))
+        return
+    with GraphWriter(sys.stdout, args.format) as out:
+        out.write_all(graphs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Headless, parallel PNG rendering of graph catalogues.
+
+The Sage scripts here call G.plot().save() once per graph, in one
+process, building a new figure every time.  This renders with
+matplotlib's Agg backend in a process pool instead: every worker builds
+one Figure / canvas (with its line, marker and label artists) when it
+starts and only updates their data per graph, and graphs travel to the
+workers as graph6 / sparse6 lines.
+
+With --sheet RxC each image is a contact sheet of R*C graphs, titled by
+their index in the input, so a catalogue of 12k graphs becomes ~120 files.
+
+Usage:
+    python render_graphs.py graphs8.g6 -o graphs_8 --prefix graph_8
+    python graph_enum.py 8 | python render_graphs.py - -o sheets_8 --sheet 10x10
+    python render_graphs.py --enumerate 7 6 -o graphs_7_6edges --prefix graph_7_6edges
+"""
+import argparse
+import os
+import sys
+import time
+from itertools import islice
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use("Agg")
+import networkx as nx  # noqa: E402
+import numpy as np  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.collections import LineCollection  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from graph_enum import enumerate_graph6  # noqa: E402
+# Cospectral/bt_cospt modules, put on sys.path by graph_enum
+from canonical import iter_bits  # noqa: E402
+from graph6 import decode  # noqa: E402
+
+
+# ---------- Layout ----------
+def graph_layout(adj, layout="spring", seed=0):
+    """(n, 2) vertex positions in [-1, 1]^2 of the graph with neighbour bitmasks adj."""
+    n = len(adj)
+    if layout == "circular" or n < 3:
+        t = np.pi / 2 + 2 * np.pi * np.arange(n) / max(n, 1)
+        return np.column_stack([np.cos(t), np.sin(t)]) if n > 1 else np.zeros((n, 2))
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from((u, w) for u in range(n) for w in iter_bits(adj[u]) if u < w)
+    if layout == "spring":
+        pos = nx.spring_layout(G, seed=seed)
+    elif layout == "kamada_kawai":
+        pos = nx.kamada_kawai_layout(G)
+    else:
+        raise ValueError("Invalid layout. Choose from 'spring', 'kamada_kawai' or 'circular'.")
+    P = np.array([pos[u] for u in range(n)])
+    P -= (P.max(axis=0) + P.min(axis=0)) / 2
+    r = np.abs(P).max()
+    return P / r if r > 0 else P
+
+
+# ---------- Drawing ----------
+class _Sheet:
+    """
+    One figure with a single axes on which a rows x cols grid of graphs
+    is drawn; its edge, vertex, label and title artists are created once
+    and only get new data for every image.
+    """
+
+    def __init__(self, rows, cols, size, dpi, labels):
+        self.rows, self.cols = rows, cols
+        self.fig = Figure(figsize=(cols * size, rows * size), dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        ax = self.fig.add_axes((0, 0, 1, 1))
+        ax.set_axis_off()
+        # cell (r, c) spans [2.5c, 2.5c + 2.5] x [-2.5r - 2.5, -2.5r]
+        ax.set_xlim(0, 2.5 * cols)
+        ax.set_ylim(-2.5 * rows, 0)
+        ax.set_aspect("equal")
+        single = rows * cols == 1
+        self.font_size = 10 if single else 7
+        self.edges = LineCollection(np.zeros((0, 2, 2)), colors="gray", linewidths=1, zorder=1)
+        ax.add_collection(self.edges)
+        self.nodes = ax.scatter(np.zeros(0), np.zeros(0), s=300 if single else 40,
+                                c="skyblue", edgecolors="black", zorder=2)
+        self.titles = [ax.text(2.5 * c + 1.25, -2.5 * r - 0.05, "", ha="center", va="top",
+                               fontsize=self.font_size)
+                       for r in range(rows) for c in range(cols)]
+        self.show_labels = labels
+        self.labels = []
+        self.ax = ax
+
+    def _text(self, i):
+        while len(self.labels) <= i:
+            self.labels.append(self.ax.text(0, 0, "", ha="center", va="center",
+                                            fontsize=self.font_size, zorder=3))
+        return self.labels[i]
+
+    def draw(self, graphs, path):
+        """graphs: [(title, adj, pos), ...], at most rows * cols of them."""
+        segments, points = [], []
+        for k, (title, adj, pos) in enumerate(graphs):
+            r, c = divmod(k, self.cols)
+            # positions in [-1, 1]^2, scaled into the cell below its title
+            p = pos * 1.05 + (2.5 * c + 1.25, -2.5 * r - 1.3)
+            n = len(adj)
+            edges = [(u, w) for u in range(n) for w in iter_bits(adj[u]) if u < w]
+            if edges:
+                segments.append(p[np.array(edges)])
+            points.append(p)
+            self.titles[k].set_text(title)
+        for t in self.titles[len(graphs):]:
+            t.set_text("")
+        self.edges.set_segments(np.concatenate(segments) if segments else np.zeros((0, 2, 2)))
+        self.nodes.set_offsets(np.concatenate(points) if points else np.zeros((0, 2)))
+        used = 0
+        if self.show_labels:
+            for p in points:
+                for u, xy in enumerate(p):
+                    t = self._text(used)
+                    t.set_position(xy)
+                    t.set_text(str(u))
+                    t.set_visible(True)
+                    used += 1
+        for t in self.labels[used:]:
+            t.set_visible(False)
+        # zlib level 1: PNG encoding otherwise dominates the time per image
+        self.fig.savefig(path, pil_kwargs={"compress_level": 1})
+
+
+_worker = {}
+
+
+def _init(rows, cols, size, dpi, labels, layout, seed):
+    _worker.update(sheet=_Sheet(rows, cols, size, dpi, labels), layout=layout, seed=seed)
+
+
+def _render(task):
+    """Draw one image: task = (path, [(title, graph6 or sparse6), ...])."""
+    path, items = task
+    graphs = []
+    for title, s in items:
+        adj = decode(s)
+        graphs.append((title, adj, graph_layout(adj, _worker["layout"], _worker["seed"])))
+    _worker["sheet"].draw(graphs, path)
+    return len(items)
+
+
+def _tasks(lines, folder, prefix, per_image):
+    lines = ((i, s) for i, s in enumerate(lines))
+    k = 0
+    while True:
+        items = list(islice(lines, per_image))
+        if not items:
+            return
+        if per_image == 1:
+            i, s = items[0]
+            yield os.path.join(folder, f"{prefix}_{i}.png"), [("", s)]
+        else:
+            yield (os.path.join(folder, f"{prefix}_sheet_{k:05d}.png"),
+                   [(str(i), s) for i, s in items])
+        k += 1
+
+
+def render_graphs(lines, folder, prefix="graph", sheet=None, workers=None,
+                  layout="spring", seed=0, size=None, dpi=100, labels=None):
+    """
+    Render graphs (an iterable of graph6 / sparse6 strings) to PNGs in
+    `folder`; returns the number of graphs drawn.
+
+    Parameters:
+    -----------
+    sheet : (rows, cols) or None
+        None for one image per graph ({prefix}_{i}.png, i = input index),
+        else contact sheets of rows * cols graphs ({prefix}_sheet_{k}.png).
+    workers : int or None
+        Pool size (default os.cpu_count()); 1 renders in this process.
+    size : float or None
+        Inches per graph (default 5 for single images, 1.6 on sheets).
+    labels : bool or None
+        Vertex labels (default: on for single images, off on sheets).
+    """
+    rows, cols = sheet or (1, 1)
+    single = rows * cols == 1
+    size = (5.0 if single else 1.6) if size is None else size
+    labels = single if labels is None else labels
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(folder, exist_ok=True)
+
+    init = (rows, cols, size, dpi, labels, layout, seed)
+    tasks = _tasks((s for s in lines if s and not s.startswith("#")), folder, prefix, rows * cols)
+    if workers == 1:
+        _init(*init)
+        return sum(map(_render, tasks))
+    with Pool(workers, initializer=_init, initargs=init) as pool:
+        return sum(pool.imap_unordered(_render, tasks, chunksize=4 if single else 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render graph6/sparse6 graphs to PNG files with a process pool.")
+    parser.add_argument("files", nargs="*", help="graph6/sparse6 files, one graph per line ('-' = stdin)")
+    parser.add_argument("--enumerate", nargs="+", type=int, metavar=("N", "E"),
+                        help="render all graphs on N vertices (and E edges) instead of files")
+    parser.add_argument("-o", "--out", default="rendered", help="output folder")
+    parser.add_argument("--prefix", default="graph", help="file name prefix")
+    parser.add_argument("--sheet", help="contact sheets of RxC graphs, e.g. 10x10")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--layout", default="spring", choices=("spring", "kamada_kawai", "circular"))
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.enumerate:
+        lines = enumerate_graph6(*args.enumerate[:2])
+    elif args.files:
+        lines = (line.strip() for path in args.files
+                 for line in (sys.stdin if path == "-" else open(path)))
+    else:
+        parser.error("give graph files or --enumerate N [E]")
+    sheet = None
+    if args.sheet:
+        rows, _, cols = args.sheet.partition("x")
+        sheet = (int(rows), int(cols or rows))
+
+    t0 = time.time()
+    count = render_graphs(lines, args.out, args.prefix, sheet, args.workers, args.layout, dpi=args.dpi)
+    dt = time.time() - t0
+    print(f"{count} graphs rendered to {args.out} in {dt:.1f} s ({count / dt if dt else 0:.0f} graphs/s)")
+
+
+if __name__ == "__main__":
+    main()
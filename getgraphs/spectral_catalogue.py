@@ -0,0 +1,117 @@
+"""
+Columnar spectral catalogue of all graphs with n vertices and e edges.
+
+One file per (n, e) instead of one .txt per graph: a NumPy .npy file
+holding a structured array with one fixed-size record per isomorphism
+class,
+
+    graph6      S{k}            graph6 string (fixed length for fixed n)
+    degrees     uint8 (n,)      degree sequence, non-increasing
+    adjacency   float64 (n,)    sorted spectrum of A
+    laplacian   float64 (n,)    ... of L = D - A
+    signless    float64 (n,)    ... of Q = D + A
+
+so analysis code opens it with one mmap and slices columns directly:
+
+    cat = load_catalogue("graphs_7_6edges/graphs_7_6edges.npy")
+    cat["adjacency"][:, -1]                   # spectral radii, no parsing
+
+Graphs come from graph_enum.py and spectra from one stacked eigvalsh per
+chunk (Cospectral/bt_cospt/spectrum.py); records are appended as they
+are computed and the header is patched with the final count, so memory
+stays at one chunk.
+
+Usage:
+    python spectral_catalogue.py 7 6
+    python spectral_catalogue.py 9 12 --matrices adjacency,laplacian -o catalogues
+"""
+import argparse
+import os
+
+import numpy as np
+
+from graph_enum import enumerate_adjacency
+# Cospectral/bt_cospt modules, put on sys.path by graph_enum
+from bitgraph import BitGraph
+from graph6 import encode_graph6
+from spectrum import MATRICES, chunked, spectrum_arrays
+
+_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def record_dtype(n, matrices=("adjacency", "laplacian", "signless")):
+    """Structured dtype of one catalogue record for graphs on n vertices."""
+    g6_len = len(encode_graph6([0] * n))
+    deg = np.uint8 if n < 256 else np.uint16
+    return np.dtype([("graph6", f"S{g6_len}"), ("degrees", deg, (n,))]
+                    + [(m, np.float64, (n,)) for m in matrices])
+
+
+def _header(dtype, count, length=None):
+    """
+    .npy (version 1.0) header for `count` records.  The first call leaves
+    room for a 20-digit count; pass its length back to rewrite it in place.
+    """
+    d = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (count,)}
+    text = repr(d)
+    if length is None:
+        length = len(text) + 21
+        length += -(len(_MAGIC) + 2 + length) % 64
+    text = text.ljust(length - 1) + "\n"
+    return _MAGIC + length.to_bytes(2, "little") + text.encode("latin1")
+
+
+def write_catalogue(n, e, path, matrices=("adjacency", "laplacian", "signless"),
+                    chunk=8192, **limits):
+    """
+    Write the catalogue of all graphs with n vertices and e edges to
+    `path` (keyword arguments as in graph_enum.enumerate_graphs); returns
+    the number of records.
+    """
+    dtype = record_dtype(n, matrices)
+    count = 0
+    with open(path, "wb") as fh:
+        header = _header(dtype, 0)
+        fh.write(header)
+        for batch in chunked(enumerate_adjacency(n, e, **limits), chunk):
+            rec = np.zeros(len(batch), dtype=dtype)
+            rec["graph6"] = [encode_graph6(adj).encode() for adj in batch]
+            rec["degrees"] = -np.sort(-np.array([[a.bit_count() for a in adj] for adj in batch]), axis=1)
+            masks = [BitGraph.from_adjacency(adj).edges for adj in batch]
+            for m, vals in spectrum_arrays(masks, n, matrices).items():
+                rec[m] = vals
+            fh.write(rec.tobytes())
+            count += len(batch)
+        fh.seek(0)
+        fh.write(_header(dtype, count, len(header) - len(_MAGIC) - 2))
+    return count
+
+
+def load_catalogue(path):
+    """Memory-mapped record array of a catalogue written by write_catalogue."""
+    return np.load(path, mmap_mode="r")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the spectral catalogue of all graphs with n vertices and e edges.")
+    parser.add_argument("n", type=int)
+    parser.add_argument("e", type=int)
+    parser.add_argument("-o", "--out", help="output folder (default graphs_{n}_{e}edges)")
+    parser.add_argument("--matrices", default="adjacency,laplacian,signless",
+                        help=f"comma-separated, from {', '.join(MATRICES)}")
+    parser.add_argument("--connected", action="store_true")
+    args = parser.parse_args()
+    matrices = args.matrices.split(",")
+    for m in matrices:
+        if m not in MATRICES:
+            parser.error(f"unknown matrix {m!r}")
+
+    folder = args.out or f"graphs_{args.n}_{args.e}edges"
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"graphs_{args.n}_{args.e}edges.npy")
+    count = write_catalogue(args.n, args.e, path, matrices, connected=args.connected)
+    print(f"{count} graphs with {args.n} vertices and {args.e} edges -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import networkx as nx
+
+# Canonical labelling from Cospectral/bt_cospt (see canonical.py there).
+_BT_COSPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cospectral", "bt_cospt")
+if _BT_COSPT not in sys.path:
+    sys.path.append(_BT_COSPT)
+from canonical import bitset_adjacency, canonical_labelling, key_bytes  # noqa: E402
+
+# Cached graph layouts.
+#
+# A layout is stored once per isomorphism class, layout name and
+# parameters, with the positions in canonical vertex order; a lookup
+# labels the query graph canonically and hands the stored positions back
+# under its own node names.  So redrawing the same product or T_{n,k}
+# (or any relabelled copy of it) skips spring_layout and the O(n^3)
+# kamada_kawai_layout.  The canonical labelling costs well under a second
+# for the few-hundred-vertex products drawn in product1.py.
+#
+# circular and shell place the nodes in the order G lists them (shell
+# also takes node lists, nlist=), so they depend on the labelling, not
+# only on the isomorphism class; they are cheap and computed directly.
+#
+# Product layouts are composed from the factor layouts instead:
+#   pos(u, v) = pos1(u) + scale * pos2(v)
+# places a small copy of G2 at every vertex of G1, for any product on
+# V(G1) x V(G2), and only the factors are laid out (and cached).
+
+LAYOUTS = {
+    "spring": nx.spring_layout,
+    "kamada": nx.kamada_kawai_layout,
+    "kamada_kawai": nx.kamada_kawai_layout,
+    "circular": nx.circular_layout,
+    "spectral": nx.spectral_layout,
+    "shell": nx.shell_layout,
+    "random": nx.random_layout,
+}
+# layouts that take a seed (the others are deterministic)
+_SEEDED = {"spring", "random"}
+# layouts that follow the node order of G, never cached
+_ORDERED = {"circular", "shell"}
+
+
+# ---------- Cache ----------
+class LayoutCache:
+    """
+    LRU cache of layouts keyed by (canonical graph key, layout, params),
+    optionally persisted as one .npy file per entry in `path`.
+
+    Parameters:
+    -----------
+    maxsize : int
+        Layouts held in memory; the least recently used is dropped first.
+    path : str or None
+        Directory for persistent entries (created if missing); entries
+        written there survive the process and are shared between runs.
+    """
+
+    def __init__(self, maxsize=128, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._mem = OrderedDict()
+        self.hits = self.misses = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, hashlib.sha1(key).hexdigest() + ".npy")
+
+    def _load(self, key):
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return self._mem[key]
+        if self.path is not None and os.path.exists(self._file(key)):
+            P = np.load(self._file(key))
+            self._store(key, P, persist=False)
+            return P
+        return None
+
+    def _store(self, key, P, persist=True):
+        self._mem[key] = P
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+        if persist and self.path is not None:
+            tmp = self._file(key) + f".{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                np.save(fh, P)
+            os.replace(tmp, self._file(key))
+
+    def layout(self, G, name="spring", seed=42, **params):
+        """
+        Positions {node: array([x, y])} of G for the networkx layout
+        `name` (see LAYOUTS) with the given parameters; seed is used by
+        (and part of the key of) "spring" and "random" only.  "circular"
+        and "shell" are computed on G itself and not cached.
+        """
+        if name not in LAYOUTS:
+            raise ValueError(f"Invalid layout. Choose from {', '.join(LAYOUTS)}.")
+        if name in _ORDERED:
+            return LAYOUTS[name](G, **params)
+        if name in _SEEDED:
+            params["seed"] = seed
+        nodes = list(G.nodes())
+        index = {u: i for i, u in enumerate(nodes)}
+        n = len(nodes)
+        lab = canonical_labelling(bitset_adjacency(n, ((index[u], index[w]) for u, w in G.edges())))
+        if name == "kamada_kawai":
+            name = "kamada"
+        key = key_bytes(n, lab.certificate) + repr((name, sorted(params.items()))).encode()
+        P = self._load(key)
+        if P is None:
+            self.misses += 1
+            # lay out the canonical copy, so the entry suits every relabelling
+            H = nx.Graph()
+            H.add_nodes_from(range(n))
+            pos = {u: i for i, u in enumerate(lab.lab)}
+            H.add_edges_from((pos[index[u]], pos[index[w]]) for u, w in G.edges())
+            layout = LAYOUTS[name](H, **params)
+            P = np.array([layout[i] for i in range(n)], dtype=float).reshape(n, 2)
+            self._store(key, P)
+        else:
+            self.hits += 1
+        return {nodes[v]: P[i] for i, v in enumerate(lab.lab)}
+
+    def clear(self):
+        """Drop the in-memory entries (files in `path` are kept)."""
+        self._mem.clear()
+
+
+_default = LayoutCache()
+
+
+def cached_layout(G, name="spring", seed=42, cache=None, **params):
+    """LayoutCache.layout on `cache`, or on a module-wide in-memory cache."""
+    return (cache or _default).layout(G, name, seed, **params)
+
+
+# ---------- Products ----------
+def _normalized(pos):
+    """Positions centred on their bounding box and scaled into [-1, 1]^2."""
+    P = np.array(list(pos.values()), dtype=float).reshape(len(pos), 2)
+    P -= (P.max(axis=0) + P.min(axis=0)) / 2 if len(P) else 0
+    r = np.abs(P).max() if len(P) else 0
+    return dict(zip(pos, P / r if r > 0 else P))
+
+
+def product_layout(G1, G2, name="spring", scale=None, seed=42, cache=None, **params):
+    """
+    Layout of any product of G1 and G2 (nodes (u, v)) composed from
+    cached factor layouts: pos(u, v) = pos1(u) + scale * pos2(v).
+
+    Parameters:
+    -----------
+    scale : float or None
+        Size of each copy of G2 relative to G1's layout; by default 0.4
+        times the smallest distance between two vertices of G1, so the
+        copies do not overlap.
+    """
+    pos1 = _normalized(cached_layout(G1, name, seed, cache, **params))
+    pos2 = _normalized(cached_layout(G2, name, seed, cache, **params))
+    if scale is None:
+        P1 = np.array(list(pos1.values()))
+        if len(P1) > 1:
+            d = np.linalg.norm(P1[:, None, :] - P1[None, :, :], axis=2)
+            d = d[np.triu_indices(len(P1), 1)].min()
+            scale = 0.4 * d if d > 0 else 0.2
+        else:
+            scale = 1.0
+    return {(u, v): pos1[u] + scale * pos2[v] for u in pos1 for v in pos2}
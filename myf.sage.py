@@ -2,13 +2,16 @@
 
 # This file was *autogenerated* from the file myf.sage
 from sage.all_cmdline import *   # import sage library
+import os, sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "getgraphs"))
+from graph_enum import enumerate_graphs
 
 _sage_const_5 = Integer(5); _sage_const_1 = Integer(1)
-n = _sage_const_5   # change this (safe up to ~8; 9+ explodes)
-gen = graphs(n)          # generator of all non-isomorphic graphs on n vertices
+n = _sage_const_5   # change this (streams: memory stays flat, time grows with the count)
+gen = enumerate_graphs(int(n))   # generator of all non-isomorphic graphs on n vertices (edge lists)
 count = sum(_sage_const_1  for _ in gen)
 count
 n = _sage_const_5 
-Gs = list(graphs(n))
+Gs = [Graph([list(range(n)), edges], format='vertices_and_edges') for edges in enumerate_graphs(int(n))]
 len(Gs)    # number of non-isomorphic graphs on n vertices
 
@@ -1,5 +1,5 @@
 import networkx as nx
-from networkx.algorithms import isomorphism
+from automorphism import has_swap_automorphism
 
 def is_biregular_distinct(G):
     """Check if bipartite G is biregular with distinct degrees."""
@@ -20,29 +20,11 @@ def is_balanced(G):
 def admits_swap_automorphism(G):
     """
     Check if bipartite graph G admits an automorphism swapping its partite sets.
-    We test isomorphism between G and its bipartition-swapped relabeling.
+    Decided from the generators of Aut(G) (see automorphism.py).
     """
     if not nx.is_bipartite(G):
         return False
-    
-    X, Y = nx.bipartite.sets(G)
-    # Swap labeling: map X->Y and Y->X
-    mapping = {x: f"x_{i}" for i, x in enumerate(X)}
-    mapping.update({y: f"y_{i}" for i, y in enumerate(Y)})
-    
-    G1 = nx.relabel_nodes(G, mapping)
-    
-    # Swap parts
-    swapped_mapping = {}
-    for i, x in enumerate(X):
-        swapped_mapping[f"x_{i}"] = f"y_{i % len(Y)}"
-    for i, y in enumerate(Y):
-        swapped_mapping[f"y_{i}"] = f"x_{i % len(X)}"
-    
-    G2 = nx.relabel_nodes(G1, swapped_mapping)
-    
-    GM = isomorphism.GraphMatcher(G1, G2)
-    return GM.is_isomorphic()
+    return has_swap_automorphism(G)
 
 def theorem_4_6(G_L, G_H):
     """Check Theorem 4.6 conditions for G_L and G_H."""
@@ -41,7 +41,7 @@ G21 = nx.random_lobster(10, 0.5, 0.5, seed=42)
 G23 = nx.random_powerlaw_tree(10, 2.5, seed=42)
 G24 = nx.bipartite.random_graph(6, 6, 0.5, seed=42)
 G25 = nx.bipartite.random_graph(6, 6, 0.5, seed=24)
-print(matrix_product(nx.to_numpy_array(G1), nx.to_numpy_array(G2), product_type))
+print(matrix_product(nx.to_numpy_array(G1), nx.to_numpy_array(G2), product_type, format="dense"))
 
 GL = G24
 GH = G25
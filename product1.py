@@ -1,18 +1,28 @@
 import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
-from numpy.linalg import eigvals
 from product2 import *
+from sparse_spectrum import symmetric_spectrum
+from layout_cache import LAYOUTS, cached_layout, product_layout
 
-# Helper: adjacency spectrum
-def adjacency_spectrum(G):
-    A = nx.to_numpy_array(G)
-    return np.sort(np.real(eigvals(A)))
+# Helper: adjacency spectrum (sparse symmetric solver, see sparse_spectrum.py)
+def adjacency_spectrum(G, k=None):
+    return symmetric_spectrum(nx.to_scipy_sparse_array(G, dtype=float), k)
 
 # Helper: normalized Laplacian spectrum
-def norm_laplacian_spectrum(G):
-    L = nx.normalized_laplacian_matrix(G).toarray() # .A is deprecated, use .toarray()
-    return np.sort(np.real(eigvals(L)))
+def norm_laplacian_spectrum(G, k=None):
+    return symmetric_spectrum(nx.normalized_laplacian_matrix(G), k)
+
+
+def _product_pos(G1, G2, G_prod, layout):
+    """
+    Positions for the draw_graph_product* functions: "product" composes
+    the cached factor layouts, any other name lays out G_prod through the
+    layout cache (unknown names fall back to spring).
+    """
+    if layout == "product":
+        return product_layout(G1, G2)
+    return cached_layout(G_prod, layout if layout in LAYOUTS else "spring", seed=42)
 
 
 def draw_graph_product_3(G1, G2, product_type="tensor", layout="spring", cmap="coolwarm"):
@@ -34,22 +44,10 @@ def draw_graph_product_3(G1, G2, product_type="tensor", layout="spring", cmap="c
     else:
         raise ValueError("Invalid product_type. Choose from tensor, cartesian, strong, lexicographic.")
     
-    # --- Layout ---
-    if layout == "spring":
-        pos = nx.spring_layout(G_prod, seed=42)
-    elif layout == "circular":
-        pos = nx.circular_layout(G_prod)
-    elif layout == "kamada":
-        pos = nx.kamada_kawai_layout(G_prod)
-    elif layout == "spectral":
-        pos = nx.spectral_layout(G_prod)
-    elif layout == "shell":
-        pos = nx.shell_layout(G_prod)
-    elif layout == "random":
-        pos = nx.random_layout(G_prod, seed=42)
-    else:
-        pos = nx.spring_layout(G_prod, seed=42)
+    # --- Layout (cached, see layout_cache.py) ---
+    if layout != "product" and layout not in LAYOUTS:
         print("Invalid layout choice. Using spring layout.")
+    pos = _product_pos(G1, G2, G_prod, layout)
     
     # --- Compute degrees and normalize ---
     degrees = dict(G_prod.degree())
@@ -94,15 +92,8 @@ def draw_graph_product_2(G1, G2, product_type="tensor", layout="spring"):
     else:
         raise ValueError("Invalid product_type. Choose from tensor, cartesian, strong, lexicographic.")
     
-    # --- Layouts ---
-    if layout == "spring":
-        pos = nx.spring_layout(G_prod, seed=42)
-    elif layout == "circular":
-        pos = nx.circular_layout(G_prod)
-    elif layout == "kamada":
-        pos = nx.kamada_kawai_layout(G_prod)
-    else:
-        pos = nx.spring_layout(G_prod, seed=42)
+    # --- Layouts (cached, see layout_cache.py) ---
+    pos = _product_pos(G1, G2, G_prod, layout)
     
     # --- Vertex colors ---
     # Each node is a tuple (u, v)
@@ -151,7 +142,8 @@ def draw_graph_product(G1, G2, product_type="tensor", layout="spring"):
     product_type : str
         Type of product: "tensor", "cartesian", "strong", "lexicographic".
     layout : str
-        Layout type for visualization: "spring", "circular", "kamada".
+        Layout type for visualization: "spring", "circular", "kamada", or
+        "product" (composed from the factor layouts).
     """
     
     # Compute product graph
@@ -166,15 +158,8 @@ def draw_graph_product(G1, G2, product_type="tensor", layout="spring"):
     else:
         raise ValueError("Invalid product_type. Choose from tensor, cartesian, strong, lexicographic.")
     
-    # Choose layout
-    if layout == "spring":
-        pos = nx.spring_layout(G_prod, seed=42)
-    elif layout == "circular":
-        pos = nx.circular_layout(G_prod)
-    elif layout == "kamada":
-        pos = nx.kamada_kawai_layout(G_prod)
-    else:
-        pos = nx.spring_layout(G_prod, seed=42)
+    # Choose layout (cached, see layout_cache.py)
+    pos = _product_pos(G1, G2, G_prod, layout)
     
     # Draw graph
     plt.figure(figsize=(6, 6))
@@ -193,46 +178,52 @@ def draw_graph_product(G1, G2, product_type="tensor", layout="spring"):
 
 import numpy as np
 
-def matrix_product(A, B, product_type="tensor"):
+def matrix_product(A, B, product_type="tensor", format="csr", dtype=None):
     """
     Compute the adjacency matrix of the product of two graphs (matrix version).
     
     Parameters:
     -----------
-    A, B : numpy.ndarray
+    A, B : numpy.ndarray or scipy.sparse matrix
         Adjacency matrices of the two graphs.
     product_type : str
         One of: "tensor", "cartesian", "strong", "lexicographic".
+    format : str
+        "csr", "coo", "operator" (LinearOperator, matvec only) or "dense"
+        (see build_kron in product2.py).
+    dtype : numpy dtype or None
+        None: int8 for 0/1 matrices, float64 otherwise.
     
     Returns:
     --------
-    numpy.ndarray
+    scipy.sparse array, LinearOperator or numpy.ndarray
         Adjacency matrix of the product graph.
     """
-    I_A = np.eye(A.shape[0], dtype=int)
-    I_B = np.eye(B.shape[0], dtype=int)
-    J_B = np.ones((B.shape[0], B.shape[0]), dtype=int)
-
+    # "I" / "J" stand for the identity / all-ones factor; neither is
+    # allocated densely ("J" only by the sparse lexicographic product,
+    # whose A (x) J block has nnz(A) * n^2 entries anyway)
     if product_type == "tensor":   # Kronecker product
-        return np.kron(A, B)
+        terms = [(A, B)]
     
     elif product_type == "cartesian":
-        return np.kron(A, I_B) + np.kron(I_A, B)
+        terms = [(A, "I"), ("I", B)]
     
     elif product_type == "strong":
-        return np.kron(A, B) + np.kron(A, I_B) + np.kron(I_A, B)
+        terms = [(A, B), (A, "I"), ("I", B)]
     
     elif product_type == "lexicographic":
-        return np.kron(A, J_B) + np.kron(I_A, B)
+        terms = [(A, "J"), ("I", B)]
     
     else:
         raise ValueError("Invalid product_type. Choose from 'tensor', 'cartesian', 'strong', or 'lexicographic'.")
 
+    return build_kron(terms, A.shape[0], B.shape[0], format, dtype)
+
 np.set_printoptions(precision=4, suppress=True)
 """ # --- Example usage ---
 G1 = nx.star_graph(7)  # 3-regular graph on 7 vertices
 G2 = nx.cycle_graph(3)
-print(matrix_product(nx.to_numpy_array(G1), nx.to_numpy_array(G2), product_type="tensor"))
+print(matrix_product(nx.to_numpy_array(G1), nx.to_numpy_array(G2), product_type="tensor", format="dense"))
 val1 = theorem_3_1(G1, G2)
 val2 = theorem_3_3(G1, G2)
 
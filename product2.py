@@ -1,38 +1,133 @@
 import numpy as np
 import networkx as nx
-from numpy.linalg import eigvals
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
+from sparse_spectrum import symmetric_spectrum
+from product_spectrum import partitioned_tensor_spectrum, product_spectrum
 
 # ---------- Helper Spectra ----------
-def adjacency_spectrum(G):
-    A = nx.to_numpy_array(G, dtype=float)
-    return np.sort(np.real(eigvals(A)))
+# Symmetric solvers on sparse matrices: dense eigvalsh for small graphs,
+# Lanczos / shift-invert slicing for large ones (see sparse_spectrum.py).
+# k=None gives the full spectrum, k=5 the 5 largest eigenvalues.
+def adjacency_spectrum(G, k=None):
+    return symmetric_spectrum(nx.to_scipy_sparse_array(G, dtype=float), k)
 
-def normalized_laplacian_spectrum(G):
-    L = nx.normalized_laplacian_matrix(G).toarray()
-    return np.sort(np.real(eigvals(L)))
+def normalized_laplacian_spectrum(G, k=None):
+    return symmetric_spectrum(nx.normalized_laplacian_matrix(G), k)
+
+
+# ---------- Sparse Kronecker Builders ----------
+def compact_dtype(mats, terms=1):
+    """
+    int8 when every entry of `mats` is an integer and a sum of `terms`
+    products of entries still fits (0/1 adjacency matrices), else float64.
+    """
+    top = 1
+    for M in mats:
+        M = M.data if sp.issparse(M) else np.asarray(M)
+        if M.size and not np.array_equal(M, np.round(M)):
+            return np.float64
+        top *= max(1, int(np.abs(M).max())) if M.size else 1
+    return np.int8 if top * terms <= 127 else np.float64
+
+
+def _factor(M, size, dtype):
+    if isinstance(M, str):
+        if M == "I":
+            return sp.identity(size, dtype=dtype, format="csr")
+        # "J": a sparse matrix has to store all size^2 ones, but they are
+        # written straight into CSR arrays, without a dense np.ones
+        return sp.csr_array((np.ones(size * size, dtype=dtype),
+                             np.tile(np.arange(size), size),
+                             np.arange(0, size * size + 1, size)), shape=(size, size))
+    return sp.csr_array(M, dtype=dtype)
+
+
+def _apply(M, X, axis):
+    """M applied along one axis of X (0: M @ X, 1: X @ M^T)."""
+    if isinstance(M, str):
+        if M == "I":
+            return X
+        s = X.sum(axis=axis, keepdims=True)                          # "J"
+        return np.broadcast_to(s, X.shape)
+    return M @ X if axis == 0 else (M @ X.T).T
+
+
+def kron_operator(terms, m, n, dtype=np.float64):
+    """
+    LinearOperator for sum_k A_k (x) B_k (A_k m x m, B_k n x n) that is
+    never formed: with x = vec(X), X of shape (m, n), each term is
+    vec(A_k X B_k^T).  Factors may be "I" or "J" (identity / all-ones);
+    J is applied as the rank-one map X -> 1 (1^T X), i.e. by column /
+    row sums, so it costs O(mn) per matvec and no memory.
+    """
+    def matvec(x, transpose=False):
+        X = np.asarray(x).reshape(m, n)
+        Y = np.zeros((m, n), dtype=np.result_type(dtype, X.dtype))
+        for A, B in terms:
+            if transpose:
+                A = A if isinstance(A, str) else A.T
+                B = B if isinstance(B, str) else B.T
+            Y += _apply(B, _apply(A, X, 0), 1)
+        return Y.ravel()
+
+    return LinearOperator((m * n, m * n), matvec=matvec,
+                          rmatvec=lambda x: matvec(x, True), dtype=dtype)
+
+
+def build_kron(terms, m, n, format="csr", dtype=None):
+    """
+    Matrix sum_k A_k (x) B_k in the requested `format`: "csr" or "coo"
+    (scipy.sparse), "operator" (kron_operator, matvec only) or "dense"
+    (numpy.ndarray).  dtype=None picks int8 for 0/1 factors (see
+    compact_dtype), float64 otherwise.
+
+    A "J" factor is only symbolic in the "operator" format; the matrix
+    formats store A (x) J with nnz(A) * n^2 entries.
+    """
+    if dtype is None:
+        dtype = compact_dtype([M for t in terms for M in t if not isinstance(M, str)], len(terms))
+    if format == "operator":
+        return kron_operator(terms, m, n, dtype)
+    P = sp.csr_array((m * n, m * n), dtype=dtype)
+    for A, B in terms:
+        P = P + sp.kron(_factor(A, m, dtype), _factor(B, n, dtype), format="csr")
+    if format == "csr":
+        return P
+    if format == "coo":
+        return P.tocoo()
+    if format == "dense":
+        return P.toarray()
+    raise ValueError("Invalid format. Choose from 'csr', 'coo', 'operator' or 'dense'.")
 
 
 # ---------- Partitioned Tensor Product ----------
-def partitioned_tensor(A, B, transpose_B=False):
+def partitioned_tensor(A, B, transpose_B=False, format="csr", dtype=None):
     """
     Construct partitioned tensor product of bipartite adjacency matrices.
     
     Parameters:
     -----------
-    A : numpy.ndarray (m x n)
-    B : numpy.ndarray (p x q)
+    A : numpy.ndarray or scipy.sparse matrix (m x m)
+    B : numpy.ndarray or scipy.sparse matrix (p x p)
+        Both square: A (x) I_p + I_m (x) B is only defined then (for
+        A m x n and B p x q the two terms are mp x np and mp x mq).
     transpose_B : bool
         If True, use B^T instead of B (for H#).
+    format : str
+        "csr", "coo", "operator" or "dense" (see build_kron).
+    dtype : numpy dtype or None
+        None: int8 for 0/1 matrices, float64 otherwise.
     
     Returns:
     --------
-    numpy.ndarray
+    scipy.sparse array, LinearOperator or numpy.ndarray
         Adjacency matrix of the product.
     """
     if transpose_B:
         B = B.T
     # Kronecker-type partitioned tensor
-    return np.kron(A, np.eye(B.shape[0])) + np.kron(np.eye(A.shape[0]), B)
+    return build_kron([(A, "I"), ("I", B)], A.shape[0], B.shape[0], format, dtype)
 
 
 # ---------- Theorem 3.1 : Adjacency Cospectrality ----------
@@ -43,12 +138,10 @@ def theorem_3_1(G_L, G_H):
     A_L = nx.to_numpy_array(G_L, dtype=float)
     A_H = nx.to_numpy_array(G_H, dtype=float)
     
-    # Partitioned tensor products
-    P1 = partitioned_tensor(A_L, A_H, transpose_B=False)
-    P2 = partitioned_tensor(A_L, A_H, transpose_B=True)
-    
-    eig1 = np.sort(np.real(eigvals(P1)))
-    eig2 = np.sort(np.real(eigvals(P2)))
+    # Partitioned tensor products, from the factor spectra (Kronecker
+    # sums, see product_spectrum.py) instead of the (mn x mn) matrices
+    eig1 = partitioned_tensor_spectrum(A_L, A_H, transpose_B=False)
+    eig2 = partitioned_tensor_spectrum(A_L, A_H, transpose_B=True)
     
     return np.allclose(eig1, eig2), eig1, eig2
 
@@ -61,12 +154,10 @@ def theorem_3_3(G_L, G_H):
     L_L = nx.normalized_laplacian_matrix(G_L).toarray()
     L_H = nx.normalized_laplacian_matrix(G_H).toarray()
     
-    # Partitioned tensor products
-    P1 = partitioned_tensor(L_L, L_H, transpose_B=False)
-    P2 = partitioned_tensor(L_L, L_H, transpose_B=True)
-    
-    eig1 = np.sort(np.real(eigvals(P1)))
-    eig2 = np.sort(np.real(eigvals(P2)))
+    # Partitioned tensor products, from the factor spectra (Kronecker
+    # sums, see product_spectrum.py) instead of the (mn x mn) matrices
+    eig1 = partitioned_tensor_spectrum(L_L, L_H, transpose_B=False)
+    eig2 = partitioned_tensor_spectrum(L_L, L_H, transpose_B=True)
     
     return np.allclose(eig1, eig2), eig1, eig2
 
@@ -93,12 +184,13 @@ def print_spectra(vals, decimals=2):
 
 
 # --- Example usage ---
-G_L = nx.path_graph(3)
-G_H = nx.cycle_graph(4)
-cospec, eig1, eig2 = theorem_3_1(G_L, G_H)
-print("Adjacency Cospectral:", cospec)    
-cospec, eig1, eig2 = theorem_3_3(G_L, G_H)
-print("Normalized Laplacian Cospectral:", cospec)
-print("Eigenvalues 1:", eig1)
-print("Eigenvalues 2:", eig2)
-print("Are eigenvalues equal?", np.allclose(eig1, eig2))
\ No newline at end of file
+if __name__ == "__main__":
+    G_L = nx.path_graph(3)
+    G_H = nx.cycle_graph(4)
+    cospec, eig1, eig2 = theorem_3_1(G_L, G_H)
+    print("Adjacency Cospectral:", cospec)    
+    cospec, eig1, eig2 = theorem_3_3(G_L, G_H)
+    print("Normalized Laplacian Cospectral:", cospec)
+    print("Eigenvalues 1:", eig1)
+    print("Eigenvalues 2:", eig2)
+    print("Are eigenvalues equal?", np.allclose(eig1, eig2))
\ No newline at end of file
@@ -0,0 +1,116 @@
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+from sparse_spectrum import as_sparse, symmetric_spectrum
+
+# Spectra of graph products from the spectra of their factors.
+#
+# With A (m x m) and B (n x n) symmetric, eigenvalues l_i of A and u_j of B:
+#   tensor         A (x) B                    ->  l_i * u_j
+#   cartesian      A (x) I + I (x) A          ->  l_i + u_j
+#   strong         A(x)B + A(x)I + I(x)B      ->  (l_i + 1)(u_j + 1) - 1
+#   lexicographic  A (x) J + I (x) B          ->  union over i of spec(l_i J + B)
+# so only the factors are diagonalised: O(m^3 + n^3) (lexicographic:
+# one n x n block per distinct l_i) instead of O((mn)^3) for the product.
+
+
+# ---------- Factor spectra ----------
+def _matrix(G):
+    """Adjacency matrix of a graph, or the matrix itself."""
+    if isinstance(G, nx.Graph):
+        return nx.to_scipy_sparse_array(G, dtype=float, format="csr")
+    return G
+
+
+def _is_symmetric(M):
+    M = as_sparse(M)
+    return (abs(M - M.T) > 1e-12).nnz == 0
+
+
+def factor_spectrum(G):
+    """
+    Sorted eigenvalues of a factor (graph -> adjacency matrix).
+
+    Symmetric matrices use the symmetric solvers of sparse_spectrum.py;
+    any other square matrix falls back to numpy.linalg.eigvals, sorted
+    by real part.
+    """
+    M = _matrix(G)
+    if _is_symmetric(M):
+        return symmetric_spectrum(M)
+    M = M.toarray() if sp.issparse(M) else np.asarray(M, dtype=float)
+    vals = np.linalg.eigvals(M)
+    return vals[np.lexsort((vals.imag, vals.real))]
+
+
+def _sorted(vals):
+    if np.iscomplexobj(vals):
+        return vals[np.lexsort((vals.imag, vals.real))]
+    return np.sort(vals)
+
+
+# ---------- Product spectra ----------
+def kronecker_sum_spectrum(A, B):
+    """Spectrum of A (x) I + I (x) B: all sums l_i + u_j."""
+    return _sorted(np.add.outer(factor_spectrum(A), factor_spectrum(B)).ravel())
+
+
+def lexicographic_spectrum(A, B):
+    """
+    Spectrum of A (x) J + I (x) B without forming it.
+
+    In an eigenbasis of A the product is block diagonal with blocks
+    l_i J + B, so each distinct eigenvalue of A costs one n x n
+    eigendecomposition; repeated eigenvalues reuse their block.
+    """
+    lam = factor_spectrum(A)
+    B = _matrix(B)
+    B = B.toarray() if sp.issparse(B) else np.asarray(B, dtype=float)
+    n = B.shape[0]
+    distinct, counts = np.unique(np.round(lam, 10), return_counts=True)
+    blocks = distinct[:, None, None] * np.ones((n, n)) + B
+    vals = np.linalg.eigvalsh(blocks)                  # (#distinct, n)
+    return np.sort(np.repeat(vals, counts, axis=0).ravel())
+
+
+def product_spectrum(G1, G2, product_type="tensor"):
+    """
+    Adjacency spectrum of the product of G1 and G2, from factor spectra.
+
+    Parameters:
+    -----------
+    G1, G2 : networkx.Graph or square adjacency matrices
+    product_type : str
+        One of: "tensor", "cartesian", "strong", "lexicographic" (same
+        conventions as matrix_product in product1.py).
+
+    Returns:
+    --------
+    numpy.ndarray
+        Sorted spectrum, len(G1) * len(G2) values.
+    """
+    if product_type == "lexicographic":
+        return lexicographic_spectrum(G1, G2)
+    lam = factor_spectrum(G1)
+    mu = factor_spectrum(G2)
+    if product_type == "tensor":
+        vals = np.multiply.outer(lam, mu)
+    elif product_type == "cartesian":
+        vals = np.add.outer(lam, mu)
+    elif product_type == "strong":
+        vals = np.multiply.outer(lam + 1, mu + 1) - 1
+    else:
+        raise ValueError("Invalid product_type. Choose from 'tensor', 'cartesian', 'strong', or 'lexicographic'.")
+    return _sorted(vals.ravel())
+
+
+def partitioned_tensor_spectrum(A, B, transpose_B=False):
+    """
+    Spectrum of partitioned_tensor(A, B, transpose_B) (product2.py),
+    which is the Kronecker sum A (x) I + I (x) B (B^T for H#): all sums
+    l_i + u_j, without building the product.
+    """
+    B = _matrix(B)
+    if transpose_B:
+        B = B.T
+    return kronecker_sum_spectrum(A, B)
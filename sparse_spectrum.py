@@ -0,0 +1,182 @@
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh, splu
+
+# Matrices up to this order are diagonalised densely (LAPACK eigvalsh,
+# 8 n^2 bytes: 128 MB at 4000); above it the sparse solvers below are used.
+DENSE_MAX = 4000
+
+
+# ---------- Conversion ----------
+def as_sparse(M):
+    """
+    CSR float64 matrix of M.
+
+    Parameters:
+    -----------
+    M : networkx.Graph, numpy.ndarray or scipy.sparse matrix
+        A graph is converted to its adjacency matrix.
+    """
+    if isinstance(M, nx.Graph):
+        return nx.to_scipy_sparse_array(M, dtype=float, format="csr")
+    return sp.csr_array(M, dtype=float)
+
+
+def spectral_bounds(M):
+    """Gershgorin interval [lo, hi] containing every eigenvalue of the symmetric matrix M."""
+    M = as_sparse(M)
+    d = M.diagonal()
+    r = np.asarray(abs(M).sum(axis=1)).ravel() - np.abs(d)
+    return float((d - r).min()), float((d + r).max())
+
+
+# ---------- Extremal eigenvalues (Lanczos) ----------
+def extremal_eigenvalues(M, k=6, which="LA"):
+    """
+    k extremal eigenvalues of the symmetric matrix M, sorted.
+
+    Parameters:
+    -----------
+    which : str
+        "LA" (largest), "SA" (smallest), "LM" (largest magnitude) or
+        "BE" (k/2 from each end), as in scipy.sparse.linalg.eigsh.
+    """
+    M = as_sparse(M)
+    n = M.shape[0]
+    if k >= n - 1:
+        vals = np.linalg.eigvalsh(M.toarray())
+        if which == "LA":
+            return vals[n - k:]
+        if which == "SA":
+            return vals[:k]
+        if which == "LM":
+            return np.sort(vals[np.argsort(np.abs(vals))[n - k:]])
+        return np.concatenate([vals[:k // 2], vals[n - (k - k // 2):]])
+    return np.sort(eigsh(M, k=k, which=which, return_eigenvectors=False))
+
+
+# ---------- Full spectrum by shift-invert slicing ----------
+def _count_below(M, sigma):
+    """
+    Number of eigenvalues of M below sigma (Sylvester's law of inertia).
+
+    A symmetric sparse LU of M - sigma I without off-diagonal pivoting is
+    an LDL^T factorisation; its negative pivots count the eigenvalues
+    below sigma.  sigma is nudged when it (nearly) hits an eigenvalue, so
+    that no pivot sign is decided by rounding, or when SuperLU had to
+    pivot; returns (count, sigma actually used).
+    """
+    n = M.shape[0]
+    I = sp.identity(n, format="csc")
+    step = 1e-7 * (1 + abs(sigma))
+    for attempt in range(16):
+        try:
+            lu = splu(sp.csc_array(M - sigma * I), permc_spec="MMD_AT_PLUS_A",
+                      diag_pivot_thresh=0, options=dict(SymmetricMode=True))
+            d = lu.U.diagonal()
+            if (lu.perm_r == lu.perm_c).all() and np.abs(d).min() > 1e-10 * (1 + abs(sigma)):
+                return int((d < 0).sum()), sigma
+        except RuntimeError:        # M - sigma I exactly singular
+            pass
+        sigma += step * (attempt + 1)
+    raise RuntimeError(f"no inertia-revealing factorisation near {sigma}")
+
+
+def _nearest(M, sigma, k):
+    """
+    Up to k eigenvalues of M nearest sigma: fewer (only the converged
+    ones) when ARPACK stalls, as it can on large repeated eigenvalues.
+    """
+    if k >= M.shape[0] - 1:
+        vals = np.linalg.eigvalsh(M.toarray())
+        return vals[np.argsort(np.abs(vals - sigma))[:k]]
+    try:
+        return eigsh(M, k=k, sigma=sigma, which="LM", return_eigenvectors=False)
+    except ArpackNoConvergence as err:
+        return err.eigenvalues
+
+
+def sliced_spectrum(M, k=64, tol=1e-8):
+    """
+    Full sorted spectrum of a large sparse symmetric matrix.
+
+    The Gershgorin interval is cut into slices whose eigenvalue counts
+    come from inertia counts.  Each slice gets one shift-invert Lanczos
+    run for the (at most k) eigenvalues nearest its midpoint.  If they
+    are all of the slice's eigenvalues it is done; otherwise Lanczos
+    missed copies of a repeated eigenvalue or values further out, so the
+    multiplicity of every distinct value found is counted by inertia just
+    below and above it, and only the gaps between them are sliced again.
+    Every distinct eigenvalue thus costs two factorisations however often
+    it repeats, and a slice narrower than `tol` is filled with copies of
+    its midpoint up to its count, so no eigenvalue is ever dropped.
+    Memory stays O(nnz + n k) plus the sparse LU of each shifted matrix.
+    """
+    M = sp.csc_array(as_sparse(M))
+    n = M.shape[0]
+    if n <= 2 * k:
+        return np.linalg.eigvalsh(M.toarray())
+    lo, hi = spectral_bounds(M)
+    tol = tol * max(1.0, abs(lo), abs(hi))
+    lo, hi = lo - 10 * tol, hi + 10 * tol
+    found = []
+    stack = [(lo, 0, hi, n)]        # (a, #eigenvalues < a, b, #eigenvalues < b)
+    while stack:
+        a, ca, b, cb = stack.pop()
+        c = cb - ca
+        if c == 0:
+            continue
+        if b - a <= tol:
+            # c eigenvalues within tol of each other
+            found += [(a + b) / 2] * c
+            continue
+        # shifts off the middle: integer or half-integer graph eigenvalues
+        # would otherwise sit exactly on them
+        mid = a + (b - a) * 0.5 * (1 + 1e-3 * np.pi)
+        vals = _nearest(M, mid, min(c, k, n - 1))
+        vals = np.sort(vals[(vals >= a) & (vals < b)])
+        if len(vals) == c:
+            found.extend(vals)
+            continue
+        if not len(vals):
+            cm, m = _count_below(M, mid)
+            stack += [(m, cm, b, cb), (a, ca, m, cm)]
+            continue
+        # distinct values found, each counted between g - 10 tol and g + 10 tol
+        groups = np.split(vals, np.nonzero(np.diff(vals) > 10 * tol)[0] + 1)
+        x, cx = a, ca
+        for g in groups:
+            g_lo, g_hi = g[0] - 10 * tol, g[-1] + 10 * tol
+            cl, l = (cx, x) if g_lo <= x else _count_below(M, g_lo)
+            ch, h = (cb, b) if g_hi >= b else _count_below(M, g_hi)
+            stack.append((x, cx, l, cl))        # gap below g
+            found += [g.mean()] * (ch - cl)
+            x, cx = h, ch
+        stack.append((x, cx, b, cb))            # gap above the last value
+    return np.sort(np.asarray(found))
+
+
+# ---------- Automatic dense / sparse choice ----------
+def symmetric_spectrum(M, k=None, which="LA", dense_max=DENSE_MAX):
+    """
+    Sorted real spectrum of the symmetric matrix (or graph) M.
+
+    Parameters:
+    -----------
+    k : int or None
+        None for the full spectrum, else only k extremal eigenvalues
+        selected by `which` (see extremal_eigenvalues).
+    dense_max : int
+        Orders up to this use dense LAPACK eigvalsh; larger matrices use
+        Lanczos (k given) or shift-invert slicing (full spectrum).
+    """
+    M = as_sparse(M)
+    n = M.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    if k is not None:
+        return extremal_eigenvalues(M, k, which)
+    if n <= dense_max:
+        return np.linalg.eigvalsh(M.toarray())
+    return sliced_spectrum(M)
@@ -0,0 +1,211 @@
+"""
+Batch check of Theorems 3.1, 3.3 (product2.py) and 4.6 (noniso.py) over
+families of bipartite pairs (G_L, G_H).
+
+Everything the theorems need from one factor (bipartition and
+biadjacency matrix B, biregularity, balance, swap automorphism) is
+computed once per factor in a process pool and reused by every pair
+containing it.  For each pair the partitioned tensor products G_L (x) H
+(biadjacency B_L (x) B_H) and G_L (x) H# (B_L (x) B_H^T, the parts of H
+exchanged) are built as sparse matrices, and their adjacency and
+normalized Laplacian spectra are compared.
+
+The table reports whether the two products are cospectral; a pair
+failing a theorem's hypotheses may well not be, so a False there is
+not by itself a counterexample.
+
+Usage:
+    python verify_theorems.py random --count 20 --n1 6 --n2 6 --p 0.5 --seed 0
+    python verify_theorems.py biregular --max-n 8 --workers 4 --csv results.csv
+"""
+import argparse
+import csv
+import os
+import sys
+from itertools import product
+from multiprocessing import Pool
+
+import numpy as np
+import networkx as nx
+import scipy.sparse as sp
+
+from noniso import admits_swap_automorphism, is_balanced, is_biregular_distinct
+from sparse_spectrum import symmetric_spectrum
+
+
+# ---------- Families ----------
+def random_bipartite_family(count, n1, n2, p, seed=0):
+    """
+    `count` connected random bipartite graphs (nx.bipartite.random_graph
+    with seeds seed, seed + 1, ...; disconnected samples are skipped, as
+    noniso.py needs a unique bipartition).
+    """
+    family = []
+    while len(family) < count:
+        G = nx.bipartite.random_graph(n1, n2, p, seed=seed)
+        seed += 1
+        if nx.is_connected(G):
+            family.append(G)
+    return family
+
+
+def biregular_family(max_n):
+    """
+    One graph per isomorphism class of connected biregular bipartite
+    graphs on at most max_n vertices, from the canonical-augmentation
+    generator in Cospectral/bt_cospt.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cospectral", "bt_cospt"))
+    from generate import nonisomorphic_graphs
+
+    family = []
+    for v in range(2, max_n + 1):
+        # edge counts a * d1 = b * d2 of biregular graphs with parts a + b = v
+        sizes = {a * d1 for a in range(1, v) for d1 in range(1, v - a + 1)
+                 if (a * d1) % (v - a) == 0 and (a * d1) // (v - a) <= a}
+        for e in sorted(sizes):
+            for edges in nonisomorphic_graphs(v, e):
+                G = nx.Graph(edges)
+                G.add_nodes_from(range(v))
+                if nx.is_connected(G) and nx.is_bipartite(G):
+                    X, Y = nx.bipartite.sets(G)
+                    if len({d for _, d in G.degree(X)}) == 1 and len({d for _, d in G.degree(Y)}) == 1:
+                        family.append(G)
+    return family
+
+
+# ---------- Per-factor data ----------
+def factor_data(G):
+    """Everything Theorems 3.1 / 3.3 / 4.6 need from one factor."""
+    X, Y = nx.bipartite.sets(G)
+    B = nx.bipartite.biadjacency_matrix(G, row_order=sorted(X), column_order=sorted(Y), dtype=float)
+    return {
+        "biadj": sp.csr_array(B),
+        "biregular_distinct": is_biregular_distinct(G),
+        "balanced": is_balanced(G),
+        "swap": admits_swap_automorphism(G),
+    }
+
+
+# ---------- Per-pair checks ----------
+_cache = {}
+
+
+def _init(cache):
+    _cache.update(cache)
+
+
+def partitioned_tensor_adjacency(B1, B2):
+    """
+    Adjacency matrix of the partitioned tensor product of the bipartite
+    graphs with biadjacency matrices B1 (X1 x Y1) and B2 (X2 x Y2): parts
+    X1 x X2 and Y1 x Y2, (x, x') ~ (y, y') iff x ~ y and x' ~ y'.
+    """
+    P = sp.kron(B1, B2, format="csr")
+    return sp.bmat([[None, P], [P.T, None]], format="csr")
+
+
+def normalized_laplacian(A):
+    """I - D^-1/2 A D^-1/2 of a sparse adjacency matrix (no isolated vertices)."""
+    d = 1 / np.sqrt(A.sum(axis=1))
+    return sp.identity(A.shape[0], format="csr") - sp.diags(d) @ A @ sp.diags(d)
+
+
+def _cospectral(M1, M2):
+    if M1.shape != M2.shape:
+        return False
+    return bool(np.allclose(symmetric_spectrum(M1), symmetric_spectrum(M2)))
+
+
+def check_pair(pair):
+    """(i, j) -> one summary row, from the cached data of factors i and j."""
+    i, j = pair
+    L, H = _cache[i], _cache[j]
+    A1 = partitioned_tensor_adjacency(L["biadj"], H["biadj"])           # G_L (x) H
+    A2 = partitioned_tensor_adjacency(L["biadj"], H["biadj"].T)         # G_L (x) H#
+    ok31 = _cospectral(A1, A2)
+    ok33 = _cospectral(normalized_laplacian(A1), normalized_laplacian(A2))
+    # same verdicts, in the same order, as noniso.theorem_4_6
+    if not L["biregular_distinct"]:
+        t46 = "G_L not biregular-distinct"
+    elif not H["balanced"]:
+        t46 = "G_H not balanced"
+    elif H["swap"]:
+        t46 = "may be isomorphic"
+    else:
+        t46 = "nonisomorphic"
+    return {"L": i, "H": j, "3.1": ok31, "3.3": ok33, "4.6": t46}
+
+
+def verify(family, workers=1, pairs=None):
+    """
+    Check every pair (G_L, G_H) of `family` (or only the index pairs in
+    `pairs`); returns one row per pair.
+    """
+    n = len(family)
+    pairs = list(product(range(n), repeat=2)) if pairs is None else pairs
+    if workers > 1:
+        with Pool(workers) as pool:
+            cache = dict(enumerate(pool.map(factor_data, family)))
+        with Pool(workers, initializer=_init, initargs=(cache,)) as pool:
+            return pool.map(check_pair, pairs, chunksize=max(1, len(pairs) // (8 * workers)))
+    _init(dict(enumerate(map(factor_data, family))))
+    return [check_pair(p) for p in pairs]
+
+
+# ---------- Output ----------
+def print_table(family, rows, not_cospectral_only=False):
+    """3.1 / 3.3: are G_L (x) H and G_L (x) H# adjacency / normalized Laplacian cospectral."""
+    g6 = [nx.to_graph6_bytes(G, header=False).decode().strip() for G in family]
+    print(f"{'G_L':>12} {'G_H':>12} {'3.1':>5} {'3.3':>5}  4.6")
+    for r in rows:
+        if not_cospectral_only and r["3.1"] and r["3.3"]:
+            continue
+        print(f"{g6[r['L']]:>12} {g6[r['H']]:>12} {str(r['3.1']):>5} {str(r['3.3']):>5}  {r['4.6']}")
+    bad = sum(not (r["3.1"] and r["3.3"]) for r in rows)
+    print(f"\n{len(family)} factors, {len(rows)} pairs, {bad} with non-cospectral products")
+    counts = {}
+    for r in rows:
+        counts[r["4.6"]] = counts.get(r["4.6"], 0) + 1
+    for verdict, c in counts.items():
+        print(f"  Theorem 4.6 - {verdict}: {c}")
+
+
+def write_csv(path, family, rows):
+    g6 = [nx.to_graph6_bytes(G, header=False).decode().strip() for G in family]
+    with open(path, "w", newline="") as fh:
+        w = csv.writer(fh)
+        w.writerow(["G_L", "G_H", "theorem_3_1", "theorem_3_3", "theorem_4_6"])
+        for r in rows:
+            w.writerow([g6[r["L"]], g6[r["H"]], r["3.1"], r["3.3"], r["4.6"]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify Theorems 3.1, 3.3 and 4.6 over a family of bipartite graphs.")
+    sub = parser.add_subparsers(dest="family", required=True)
+    p = sub.add_parser("random", help="seeded random bipartite graphs")
+    p.add_argument("--count", type=int, default=20)
+    p.add_argument("--n1", type=int, default=6)
+    p.add_argument("--n2", type=int, default=6)
+    p.add_argument("--p", type=float, default=0.5)
+    p.add_argument("--seed", type=int, default=0)
+    p = sub.add_parser("biregular", help="all connected biregular bipartite graphs")
+    p.add_argument("--max-n", type=int, default=8)
+    for p in sub.choices.values():
+        p.add_argument("--workers", type=int, default=1)
+        p.add_argument("--csv", help="also write the table to this CSV file")
+        p.add_argument("--quiet", action="store_true", help="only list pairs with non-cospectral products")
+    args = parser.parse_args()
+
+    if args.family == "random":
+        family = random_bipartite_family(args.count, args.n1, args.n2, args.p, args.seed)
+    else:
+        family = biregular_family(args.max_n)
+    rows = verify(family, args.workers)
+    print_table(family, rows, args.quiet)
+    if args.csv:
+        write_csv(args.csv, family, rows)
+
+
+if __name__ == "__main__":
+    main()